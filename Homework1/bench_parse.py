@@ -0,0 +1,105 @@
+"""parse_data 基准测试
+
+生成一份合成的胡润榜单接口数据（字段与真实接口一致，包含年龄非数字、出生地缺失、
+行业为空等情况），分别用逐行循环的旧实现和整列处理的 parse_data 解析，
+输出每秒解析行数，并检查两者结果是否一致：
+
+    python bench_parse.py --rows 1000000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from main import parse_data
+
+INDUSTRIES = ['房地产', '制造业', '金融投资', '互联网', '医药', '食品饮料', '']
+PLACES = ['中国-浙江-杭州', '中国-广东-深圳', '中国-江苏', '未知', '香港']
+CITIES = ['浙江 杭州', '广东 深圳', '北京', '上海', '香港', '']
+
+
+def make_rows(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        character = {
+            'hs_Character_Fullname_Cn': f'富豪{i}',
+            'hs_Character_Gender': rng.choice(['先生', '女士']),
+            'hs_Character_Age': rng.choice([str(rng.randint(25, 95)), '未知', '']),
+        }
+        if rng.random() > 0.05:
+            character['hs_Character_NativePlace_Cn'] = rng.choice(PLACES)
+        rows.append({
+            'hs_Character': [character],
+            'hs_Rank_Rich_Wealth': rng.choice([round(rng.uniform(50, 5000), 1), None]),
+            'hs_Rank_Rich_ComName_Cn': f'公司{i % 5000}',
+            'hs_Rank_Rich_Industry_Cn': rng.choice(INDUSTRIES),
+            'hs_Rank_Rich_ComHeadquarters_Cn': rng.choice(CITIES),
+            'hs_Rank_Rich_Ranking': i + 1,
+        })
+    return rows
+
+
+def parse_data_loop(data):
+    """原来的逐行解析实现，作为对照"""
+    parsed_data = []
+    for row in data:
+        char_info = row.get('hs_Character', [{}])[0]
+        rank_info = row
+        age_str = char_info.get('hs_Character_Age', '')
+        age = int(age_str) if age_str.isdigit() else None
+        wealth = rank_info.get('hs_Rank_Rich_Wealth', 0)
+        if wealth is None:
+            wealth = 0
+        birthplace = char_info.get('hs_Character_NativePlace_Cn', '未知')
+        if birthplace != '未知':
+            birthplace = birthplace.split('-')[-1]
+        industry = rank_info.get('hs_Rank_Rich_Industry_Cn', '未知')
+        if industry == '':
+            industry = '未知'
+        parsed_data.append({
+            '姓名': char_info.get('hs_Character_Fullname_Cn', ''),
+            '财富(亿)': wealth,
+            '性别': char_info.get('hs_Character_Gender', '未知'),
+            '年龄': age,
+            '出生地': birthplace,
+            '公司': rank_info.get('hs_Rank_Rich_ComName_Cn', ''),
+            '行业': industry,
+            '总部': rank_info.get('hs_Rank_Rich_ComHeadquarters_Cn', ''),
+            '排名': rank_info.get('hs_Rank_Rich_Ranking', 0)
+        })
+    return pd.DataFrame(parsed_data)
+
+
+def timed(func, data):
+    start = time.perf_counter()
+    result = func(data)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='胡润榜单解析基准测试')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='合成数据行数')
+    args = parser.parse_args()
+
+    data = make_rows(args.rows)
+    print(f'合成数据 {len(data)} 行')
+    print(f"{'实现':<12}{'耗时(s)':>10}{'行/秒':>12}")
+    old, old_s = timed(parse_data_loop, data)
+    print(f"{'逐行循环':<12}{old_s:>10.3f}{len(data) / old_s:>12.0f}")
+    new, new_s = timed(parse_data, data)
+    print(f"{'parse_data':<12}{new_s:>10.3f}{len(data) / new_s:>12.0f}")
+    print(f'加速 {old_s / new_s:.1f} 倍')
+
+    # 一致性检查：比较共同的列，忽略列类型差异
+    same = all(old[col].astype(str).replace({'nan': '', '<NA>': '', 'None': ''}).str.removesuffix('.0').tolist()
+               == new[col].astype(str).replace({'nan': '', '<NA>': '', 'None': ''}).str.removesuffix('.0').tolist()
+               for col in old.columns)
+    if not same:
+        print('警告: parse_data 的结果与逐行循环不一致')
+    print('新增列类型:', dict(new.dtypes.astype(str)))
+
+
+if __name__ == '__main__':
+    main()
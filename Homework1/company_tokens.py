@@ -0,0 +1,84 @@
+"""公司名称分词与持久化缓存
+
+公司名称在不同年份、不同榜单之间大量重复，每个不同的名称只分词一次：
+分词结果按名称保存在 jieba_cache.json 中（记录 jieba 版本，版本变化时缓存作废），
+之后的运行只对缓存中没有的名称分词。只有存在未缓存的名称时才导入 jieba 并加载词典；
+未缓存的名称很多且 processes > 1 时按块分给进程池，每个进程各自加载一次词典。
+词频按名称出现次数加权，由 (词, 次数) 两列一次分组求和得到。
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+
+import pandas as pd
+
+CACHE_FILE = 'jieba_cache.json'
+CHUNK_SIZE = 5_000
+MIN_LENGTH = 2
+
+_jieba = None
+
+
+def _segmenter():
+    """第一次真正需要分词时才导入 jieba 并加载词典"""
+    global _jieba
+    if _jieba is None:
+        import jieba
+        jieba.initialize()
+        _jieba = jieba
+    return _jieba
+
+
+def _segment_chunk(names):
+    """对一块公司名称分词，返回词列表的列表"""
+    jieba = _segmenter()
+    return [jieba.lcut(name) for name in names]
+
+
+class TokenCache:
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self.version = metadata.version('jieba')
+        self.tokens = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('jieba') == self.version:
+                self.tokens = data['tokens']
+
+    def save(self):
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'jieba': self.version, 'tokens': self.tokens}, f, ensure_ascii=False)
+        os.replace(self.path + '.tmp', self.path)
+
+    def segment(self, names, processes=1, chunk_size=CHUNK_SIZE):
+        """保证 names 中的每个名称都已分词，返回本次新分词的名称数"""
+        missing = [name for name in dict.fromkeys(names) if name not in self.tokens]
+        if not missing:
+            return 0
+        if processes <= 1 or len(missing) <= chunk_size:
+            tokens = _segment_chunk(missing)
+        else:
+            chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+            tokens = []
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                for part in executor.map(_segment_chunk, chunks):
+                    tokens.extend(part)
+        self.tokens.update(zip(missing, tokens))
+        self.save()
+        return len(missing)
+
+
+def word_frequencies(names, cache=None, processes=1, min_length=MIN_LENGTH):
+    """公司名称 Series 中各词的出现次数（不含长度小于 min_length 的词），按次数降序"""
+    cache = cache if cache is not None else TokenCache()
+    name_counts = names.dropna().astype(str).value_counts()
+    segmented = cache.segment(name_counts.index, processes=processes)
+    print(f"公司名称 {len(name_counts)} 个，其中 {segmented} 个新分词，其余来自缓存")
+    # 每个名称的词列表展开成一行一个词，行的权重为该名称出现的次数
+    words = pd.Series([cache.tokens[name] for name in name_counts.index],
+                      index=name_counts.to_numpy(), dtype=object).explode().dropna()
+    freq = pd.Series(words.index, index=words.to_numpy()).groupby(level=0).sum()
+    freq = freq[freq.index.str.len() >= min_length]
+    return freq.sort_values(ascending=False, kind='stable')
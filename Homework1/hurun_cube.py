@@ -0,0 +1,63 @@
+"""胡润百富榜聚合立方体
+
+对解析后的榜单只做一次 groupby，得到 (榜单 ×) 行业 × 年龄段 × 性别 × 省份 × 出生地 的立方体，
+每个格子保存人数和财富总和。main.py 中的计数类图表和任意临时切片都从立方体上按维度求和得到，
+不再各自扫描原始数据，也不会往原始 DataFrame 上添加列。多个榜单合并时 '榜单' 也是一个维度。
+"""
+import pandas as pd
+
+# 年龄段划分
+AGE_BINS = [0, 30, 40, 50, 60, 70, 100]
+AGE_LABELS = ['30岁以下', '31-40岁', '41-50岁', '51-60岁', '61-70岁', '70岁以上']
+DIMENSIONS = ['榜单', '行业', '年龄段', '性别', '省份', '出生地']
+
+
+def age_band(ages):
+    return pd.cut(ages, bins=AGE_BINS, labels=AGE_LABELS, right=False)
+
+
+class HurunCube:
+    def __init__(self, df):
+        keys = {'年龄段': age_band(df['年龄'])}
+        for dim in DIMENSIONS:
+            if dim != '年龄段' and dim in df.columns:
+                keys[dim] = df[dim]
+        self.dimensions = [dim for dim in DIMENSIONS if dim in keys]
+        frame = pd.DataFrame({dim: keys[dim] for dim in self.dimensions})
+        frame['财富'] = df['财富(亿)'].to_numpy()
+        # 缺失的年龄、出生地等也保留为单独的格子，总人数与原始数据一致
+        self.cube = frame.groupby(self.dimensions, observed=True, dropna=False).agg(
+            人数=('财富', 'size'),
+            财富=('财富', 'sum'),
+        )
+
+    def slice(self, by, **filters):
+        """按 by 中的维度汇总人数和财富，filters 为 维度=取值（或取值列表），例如
+        cube.slice('省份', 行业='房地产', 性别='女士')；汇总时不含该维度缺失的格子
+        """
+        cube = self.cube
+        for dim, value in filters.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            cube = cube[cube.index.get_level_values(dim).isin(values)]
+        return cube.groupby(level=by, observed=True).sum()
+
+    def counts(self, dim, exclude=()):
+        """某维度各取值的人数，按人数降序"""
+        counts = self.slice(dim)['人数']
+        counts = counts[~counts.index.isin(list(exclude))]
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def wealth(self, dim):
+        """某维度各取值的财富总和，按财富降序"""
+        return self.slice(dim)['财富'].sort_values(ascending=False, kind='stable')
+
+    def age_counts(self):
+        """各年龄段人数，按年龄段顺序，没有人的年龄段为 0"""
+        return self.slice('年龄段')['人数'].reindex(AGE_LABELS, fill_value=0)
+
+    def industry_age_share(self, top_n=15):
+        """人数前 top_n 个行业的 行业 × 年龄段 占比表（每行和为 1，不含年龄缺失的人）"""
+        top_industries = self.counts('行业').head(top_n).index
+        counts = self.slice(['行业', '年龄段'], 行业=list(top_industries))['人数'].unstack(fill_value=0)
+        counts = counts.reindex(columns=[a for a in AGE_LABELS if a in counts.columns])
+        return counts.div(counts.sum(axis=1), axis=0)
@@ -0,0 +1,168 @@
+"""多年胡润百富榜历史库
+
+每年的榜单作为一个快照保存为 hurun_history/<年份>.csv，人物和公司在所有年份之间共用稳定的整数编号：
+people.csv 的第 i 行是编号为 i 的人物（姓名、性别、同名序号），companies.csv 的第 i 行是编号为 i 的公司。
+入库时用哈希索引（pandas 的 get_indexer）把整年的人物、公司一次映射到已有编号，没见过的才追加新编号。
+内存中每年的快照以 person_id 为索引，某人某年的排名、财富是一次哈希查找；
+两年之间的排名变化、财富变化、新上榜和落榜是两张快照按 person_id 的一次外连接。
+"""
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+HISTORY_DIR = 'hurun_history'
+PERSON_KEY = ['姓名', '性别', '同名序号']
+SNAPSHOT_COLUMNS = ['person_id', 'company_id', '排名', '财富(亿)', '年龄', '行业', '总部']
+
+
+class HurunHistory:
+    def __init__(self, directory=HISTORY_DIR):
+        self.directory = directory
+        self.people_path = os.path.join(directory, 'people.csv')
+        self.companies_path = os.path.join(directory, 'companies.csv')
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.people_path):
+            self.people = pd.read_csv(self.people_path, index_col='person_id', keep_default_na=False,
+                                      encoding='utf_8_sig')
+        else:
+            self.people = pd.DataFrame({col: [] for col in PERSON_KEY}).astype({'同名序号': 'int64'})
+        if os.path.exists(self.companies_path):
+            self.companies = pd.read_csv(self.companies_path, index_col='company_id', keep_default_na=False,
+                                         encoding='utf_8_sig')
+        else:
+            self.companies = pd.DataFrame({'公司': []})
+        # 年份 -> 以 person_id 为索引的快照
+        self.snapshots = {}
+        for name in sorted(os.listdir(directory)):
+            match = re.fullmatch(r'(\d{4})\.csv', name)
+            if match:
+                snapshot = pd.read_csv(os.path.join(directory, name), encoding='utf_8_sig')
+                self.snapshots[int(match.group(1))] = snapshot.set_index('person_id')
+        self._name_ids = None
+
+    @property
+    def years(self):
+        return sorted(self.snapshots)
+
+    def snapshot_path(self, year):
+        return os.path.join(self.directory, f'{year}.csv')
+
+    def _save_table(self, table, path, label):
+        table.to_csv(path + '.tmp', index_label=label, encoding='utf_8_sig')
+        os.replace(path + '.tmp', path)
+
+    @staticmethod
+    def _assign(table, keys):
+        """用 table 上的哈希索引把 keys 的每一行映射为编号（行号），没有的追加到 table 末尾
+
+        返回 (新的 table, 编号数组)
+        """
+        columns = list(keys.columns)
+        known = pd.MultiIndex.from_frame(table[columns].astype(object))
+        wanted = pd.MultiIndex.from_frame(keys.astype(object))
+        new_keys = keys[known.get_indexer(wanted) == -1].drop_duplicates()
+        if len(new_keys):
+            new_keys.index = pd.RangeIndex(len(table), len(table) + len(new_keys))
+            table = pd.concat([table, new_keys])
+            known = pd.MultiIndex.from_frame(table[columns].astype(object))
+        return table, known.get_indexer(wanted)
+
+    def ingest(self, df, year):
+        """把解析后的一年榜单存为快照（已有该年份时覆盖），返回带 person_id、company_id 的快照"""
+        df = df.reset_index(drop=True)
+        keys = pd.DataFrame({'姓名': df['姓名'].astype(str).str.strip(), '性别': df['性别'].astype(str)})
+        # 同一年里同名同性别的人按排名先后编号，避免被合并成一个人
+        by_rank = keys.loc[df['排名'].sort_values(kind='stable').index]
+        keys['同名序号'] = by_rank.groupby(['姓名', '性别']).cumcount().reindex(keys.index).astype('int64')
+        self.people, person_ids = self._assign(self.people, keys)
+
+        companies = df['公司'].fillna('').astype(str).str.strip()
+        named = (companies != '').to_numpy()
+        company_ids = np.full(len(df), -1, dtype=np.int64)
+        self.companies, company_ids[named] = self._assign(self.companies, companies[named].to_frame('公司'))
+
+        snapshot = df.reindex(columns=SNAPSHOT_COLUMNS)
+        snapshot['person_id'] = person_ids
+        snapshot['company_id'] = company_ids
+        path = self.snapshot_path(year)
+        snapshot.to_csv(path + '.tmp', index=False, encoding='utf_8_sig')
+        os.replace(path + '.tmp', path)
+        self._save_table(self.people, self.people_path, 'person_id')
+        self._save_table(self.companies, self.companies_path, 'company_id')
+        self.snapshots[year] = snapshot.set_index('person_id')
+        self._name_ids = None
+        return snapshot
+
+    def person_ids(self, name):
+        """某姓名对应的所有人物编号"""
+        if self._name_ids is None:
+            self._name_ids = self.people.groupby('姓名').groups
+        return list(self._name_ids.get(name, []))
+
+    def record(self, person_id, year):
+        """某人某年的快照行（Series），当年不在榜时为 None"""
+        snapshot = self.snapshots[year]
+        return snapshot.loc[person_id] if person_id in snapshot.index else None
+
+    def movement(self, person_id, year_from, year_to):
+        """某人两年之间的排名变化（正数为上升）、财富变化和状态"""
+        before, after = self.record(person_id, year_from), self.record(person_id, year_to)
+        if before is None and after is None:
+            status = '未上榜'
+        elif before is None:
+            status = '新上榜'
+        elif after is None:
+            status = '落榜'
+        else:
+            status = '在榜'
+        both = before is not None and after is not None
+        return {
+            '姓名': self.people.at[person_id, '姓名'],
+            '状态': status,
+            '排名变化': int(before['排名'] - after['排名']) if both else None,
+            '财富变化': after['财富(亿)'] - before['财富(亿)'] if both else None,
+        }
+
+    def history(self, person_id):
+        """某人在各年份的排名、财富和公司"""
+        rows = {year: self.snapshots[year].loc[person_id] for year in self.years
+                if person_id in self.snapshots[year].index}
+        table = pd.DataFrame.from_dict(rows, orient='index')
+        if len(table):
+            table['公司'] = self.companies['公司'].reindex(table['company_id']).to_numpy()
+        return table.rename_axis('年份')
+
+    def diff(self, year_from, year_to):
+        """两年榜单的整体对比：按 person_id 外连接，得到排名变化（正数为上升）、财富变化和状态"""
+        columns = ['排名', '财富(亿)']
+        joined = self.snapshots[year_from][columns].join(
+            self.snapshots[year_to][columns], how='outer', lsuffix=f'_{year_from}', rsuffix=f'_{year_to}')
+        before, after = joined[f'排名_{year_from}'], joined[f'排名_{year_to}']
+        joined['排名变化'] = before - after
+        joined['财富变化'] = joined[f'财富(亿)_{year_to}'] - joined[f'财富(亿)_{year_from}']
+        joined['状态'] = np.select([before.isna(), after.isna()], ['新上榜', '落榜'], default='在榜')
+        joined.insert(0, '姓名', self.people['姓名'].reindex(joined.index).to_numpy())
+        return joined
+
+    def new_entrants(self, year_from, year_to):
+        diff = self.diff(year_from, year_to)
+        return diff[diff['状态'] == '新上榜']
+
+    def dropouts(self, year_from, year_to):
+        diff = self.diff(year_from, year_to)
+        return diff[diff['状态'] == '落榜']
+
+    def company_diff(self, year_from, year_to):
+        """两年之间各公司上榜人数和财富总和的变化"""
+        def totals(year):
+            snapshot = self.snapshots[year]
+            snapshot = snapshot[snapshot['company_id'] >= 0]
+            return snapshot.groupby('company_id').agg(人数=('排名', 'size'), 财富=('财富(亿)', 'sum'))
+        joined = totals(year_from).join(totals(year_to), how='outer',
+                                         lsuffix=f'_{year_from}', rsuffix=f'_{year_to}').fillna(0)
+        joined['人数变化'] = joined[f'人数_{year_to}'] - joined[f'人数_{year_from}']
+        joined['财富变化'] = joined[f'财富_{year_to}'] - joined[f'财富_{year_from}']
+        joined.insert(0, '公司', self.companies['公司'].reindex(joined.index).to_numpy())
+        return joined.sort_values('财富变化', ascending=False, kind='stable')
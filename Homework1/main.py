@@ -1,112 +1,179 @@
-import requests
-import json
+# 这里只导入各子命令都要用的轻量库，requests/matplotlib/seaborn/jieba/wordcloud 在用到的函数内才导入
+import time
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-import jieba
-from wordcloud import WordCloud
-from collections import Counter
-import re
 import os
+import argparse
 
-# 创建保存图表的文件夹
-if not os.path.exists('charts'):
-    os.makedirs('charts')
+from hurun_cube import HurunCube, age_band
+from table_format import iter_pages
 
-# 设置中文字体
-plt.rcParams['font.sans-serif'] = ['SimHei']  # 解决中文显示问题
-plt.rcParams['axes.unicode_minus'] = False    # 解决负号显示问题
+DATA_FILE = '胡润百富榜2024.csv'
+
+def _pyplot():
+    """按需导入 matplotlib，创建保存图表的文件夹并设置中文字体"""
+    import matplotlib.pyplot as plt
+    if not os.path.exists('charts'):
+        os.makedirs('charts')
+    plt.rcParams['font.sans-serif'] = ['SimHei']  # 解决中文显示问题
+    plt.rcParams['axes.unicode_minus'] = False    # 解决负号显示问题
+    return plt
 
 # 1. 爬取胡润百富榜数据
-def fetch_hurun_data():
-    url = "https://www.hurun.net/zh-CN/Rank/HsRankDetailsList?num=ODBYW2BI&search=&offset=0&limit=2000"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36 Edg/135.0.0.0'
-    }
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # 解析JSON数据
-        data = response.json()
-        return data['rows']
-    except Exception as e:
-        print(f"数据获取失败: {e}")
-        return None
+HURUN_URL = "https://www.hurun.net/zh-CN/Rank/HsRankDetailsList"
+HURUN_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36 Edg/135.0.0.0'
+}
+DEFAULT_LIST_IDS = ['ODBYW2BI']  # 2024胡润百富榜
+
+def fetch_page(session, list_id, offset, limit, retries=3, timeout=15):
+    """请求榜单的一页，失败时单独重试这一页，返回 (rows, total)"""
+    params = {'num': list_id, 'search': '', 'offset': offset, 'limit': limit}
+    for attempt in range(1, retries + 1):
+        try:
+            response = session.get(HURUN_URL, params=params, headers=HURUN_HEADERS, timeout=timeout)
+            response.raise_for_status()
+            data = response.json()
+            return data['rows'], data.get('total')
+        except Exception as e:
+            if attempt == retries:
+                raise
+            print(f"第 {offset // limit + 1} 页请求失败（{e}），第 {attempt} 次重试...")
+            time.sleep(attempt)
+
+def fetch_hurun_data(list_ids=None, page_size=200, max_workers=4):
+    """按 offset/limit 分页并发爬取一个或多个榜单（num 参数），每页到达后立即解析
+
+    返回 (DataFrame, 失败的页)：DataFrame 多个榜单时增加 '榜单' 列，全部失败时为 None；
+    失败的页为重试后仍失败的 (榜单ID, offset) 列表，由调用方决定是否使用不完整的数据
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    list_ids = list_ids or DEFAULT_LIST_IDS
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_maxsize=max_workers))
+
+    pages = {}
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 每个榜单先取第一页，得到总条数后再并发请求其余页
+        first = {executor.submit(fetch_page, session, list_id, 0, page_size): list_id for list_id in list_ids}
+        futures = {}
+        for future in as_completed(first):
+            list_id = first[future]
+            try:
+                rows, total = future.result()
+            except Exception as e:
+                print(f"榜单 {list_id} 获取失败: {e}")
+                failed.append((list_id, 0))
+                continue
+            pages[(list_id, 0)] = parse_data(rows)
+            total = total if total is not None else len(rows)
+            print(f"榜单 {list_id} 共 {total} 条，每页 {page_size} 条")
+            for offset in range(page_size, total, page_size):
+                futures[executor.submit(fetch_page, session, list_id, offset, page_size)] = (list_id, offset)
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                rows, _ = future.result()
+            except Exception as e:
+                print(f"榜单 {key[0]} offset={key[1]} 获取失败: {e}")
+                failed.append(key)
+                continue
+            pages[key] = parse_data(rows)
+    session.close()
+
+    if failed:
+        print(f"共 {len(failed)} 页获取失败: {failed}")
+    if not pages:
+        print("数据获取失败")
+        return None, failed
+    frames = []
+    for (list_id, offset) in sorted(pages, key=lambda k: (list_ids.index(k[0]), k[1])):
+        frame = pages[(list_id, offset)]
+        if len(list_ids) > 1:
+            frame.insert(0, '榜单', list_id)
+        frames.append(frame)
+    return combine_pages(frames), failed
 
 # 2. 解析数据并创建DataFrame
+# 榜单字段 -> 列名
+RANK_FIELDS = {
+    'hs_Rank_Rich_Wealth': '财富(亿)',
+    'hs_Rank_Rich_ComName_Cn': '公司',
+    'hs_Rank_Rich_Industry_Cn': '行业',
+    'hs_Rank_Rich_ComHeadquarters_Cn': '总部',
+    'hs_Rank_Rich_Ranking': '排名',
+}
+# 人物字段（hs_Character 的第一个人）-> 列名
+CHARACTER_FIELDS = {
+    'hs_Character_Fullname_Cn': '姓名',
+    'hs_Character_Gender': '性别',
+    'hs_Character_Age': '年龄',
+    'hs_Character_NativePlace_Cn': '出生地',
+}
+COLUMNS = ['姓名', '财富(亿)', '性别', '年龄', '出生地', '公司', '行业', '总部', '排名', '省份']
+DTYPES = {
+    '财富(亿)': 'float64',
+    '年龄': 'Int16',
+    '排名': 'int32',
+    '性别': 'category',
+    '行业': 'category',
+    '出生地': 'category',
+    '省份': 'category',
+}
+
+def typed_frame(df):
+    """按 DTYPES 设置列类型（读取CSV后也用它恢复类型）"""
+    return df.astype({col: dtype for col, dtype in DTYPES.items() if col in df.columns})
+
+def combine_pages(frames):
+    """合并各页解析结果；各页分类列的类别不同，合并后会变回字符串，所以合并后重新设置类型"""
+    return typed_frame(pd.concat(frames, ignore_index=True))
+
 def parse_data(data):
-    parsed_data = []
-    
-    for row in data:
-        # 提取基本信息
-        char_info = row.get('hs_Character', [{}])[0]
-        rank_info = row
-        
-        # 处理年龄字段
-        age_str = char_info.get('hs_Character_Age', '')
-        if age_str.isdigit():
-            age = int(age_str)
-        else:
-            age = None
-            
-        # 处理财富字段
-        wealth = rank_info.get('hs_Rank_Rich_Wealth', 0)
-        if wealth is None:
-            wealth = 0
-            
-        # 处理出生地
-        birthplace = char_info.get('hs_Character_NativePlace_Cn', '未知')
-        if birthplace != '未知':
-            birthplace = birthplace.split('-')[-1]
-        
-        # 处理行业信息
-        industry = rank_info.get('hs_Rank_Rich_Industry_Cn', '未知')
-        if industry == '':
-            industry = '未知'
-        
-        parsed_data.append({
-            '姓名': char_info.get('hs_Character_Fullname_Cn', ''),
-            '财富(亿)': wealth,
-            '性别': char_info.get('hs_Character_Gender', '未知'),
-            '年龄': age,
-            '出生地': birthplace,
-            '公司': rank_info.get('hs_Rank_Rich_ComName_Cn', ''),
-            '行业': industry,
-            '总部': rank_info.get('hs_Rank_Rich_ComHeadquarters_Cn', ''),
-            '排名': rank_info.get('hs_Rank_Rich_Ranking', 0)
-        })
-    
-    return pd.DataFrame(parsed_data)
+    """把接口返回的 rows 整体展开成带类型的 DataFrame
 
-# 3. 格式化打印数据 - 确保各列对齐
-def print_formatted_data(df, num_rows=5):
-    # 获取列名
-    headers = df.columns.tolist()
-    
-    # 计算每列最大宽度
-    col_widths = [max(len(str(col)), max(df[col].astype(str).apply(len).max(), 8)) for col in headers]
-    
-    # 打印表头
-    header = " | ".join([str(headers[i]).ljust(col_widths[i]) for i in range(len(headers))])
-    print(header)
-    print("-" * len(header))
-    
-    # 打印数据行
-    for i in range(min(num_rows, len(df))):
-        row = df.iloc[i]
-        row_str = " | ".join([str(row[col]).ljust(col_widths[j]) for j, col in enumerate(headers)])
-        print(row_str)
+    每条记录取 hs_Character 中的第一个人；年龄非纯数字时为空，财富缺失为0，
+    出生地取 '-' 分隔的最后一段，行业缺失或为空时为 '未知'，总部缺失时为空，省份取总部的第一个词（总部为空时为 '未知'）
+    """
+    # 两层嵌套记录分别按字段整体展开：外层为榜单字段，内层为第一个人物的字段
+    ranks = pd.DataFrame.from_records(data, columns=['hs_Character', *RANK_FIELDS])
+    first = [c[0] if isinstance(c, list) and c else {} for c in ranks['hs_Character']]
+    people = pd.DataFrame.from_records(first, columns=list(CHARACTER_FIELDS))
+    df = pd.concat([people.rename(columns=CHARACTER_FIELDS),
+                    ranks.drop(columns='hs_Character').rename(columns=RANK_FIELDS)], axis=1)
 
+    df['姓名'] = df['姓名'].fillna('')
+    df['性别'] = df['性别'].fillna('未知')
+    age = df['年龄'].astype('string')
+    df['年龄'] = age.where(age.str.isdigit().fillna(False)).astype('Int16')
+    df['财富(亿)'] = pd.to_numeric(df['财富(亿)'], errors='coerce').fillna(0)
+    df['行业'] = df['行业'].replace('', None).fillna('未知')
+    df['公司'] = df['公司'].fillna('')
+    df['总部'] = df['总部'].fillna('')
+    df['排名'] = pd.to_numeric(df['排名'], errors='coerce').fillna(0)
+    # 出生地、省份的取值种类很少，先转为分类再只对各类别做字符串拆分
+    df['出生地'] = df['出生地'].fillna('未知').astype('category').map(lambda x: x.split('-')[-1])
+    df['省份'] = df['总部'].astype('category').map(lambda x: (x.split() or ['未知'])[0])
+    return typed_frame(df[COLUMNS])
+
+# 3. 格式化打印数据 - 按显示宽度对齐，只对输出的行计算列宽
+def print_formatted_data(df, num_rows=5, page_size=20):
+    for i, page in enumerate(iter_pages(df, page_size=page_size, num_rows=num_rows)):
+        if i:
+            print()
+        print("\n".join(page))
+
+# 以下计数类图表都接收 HurunCube，从立方体切片作图，不修改原始数据
 # 4. 行业分析 - 独立图表
-def industry_analysis(df):
+def industry_analysis(cube):
+    plt = _pyplot()
     # 行业富豪数量统计
-    industry_count = df['行业'].value_counts().head(10)
+    industry_count = cube.counts('行业').head(10)
     
     # 行业财富总值统计
-    industry_wealth = df.groupby('行业')['财富(亿)'].sum().sort_values(ascending=False).head(10)
+    industry_wealth = cube.wealth('行业').head(10)
     
     # 图表1：行业富豪数量TOP10
     plt.figure(figsize=(12, 8))
@@ -135,9 +202,10 @@ def industry_analysis(df):
     }
 
 # 5. 性别分布 - 独立图表
-def gender_distribution(df):
+def gender_distribution(cube):
+    plt = _pyplot()
     plt.figure(figsize=(10, 8))
-    gender_count = df['性别'].value_counts()
+    gender_count = cube.counts('性别')
     gender_count.plot(kind='pie', autopct='%1.1f%%', startangle=90, colors=['lightblue', 'lightpink'])
     plt.title('富豪性别分布', fontsize=15)
     plt.ylabel('')
@@ -146,12 +214,10 @@ def gender_distribution(df):
     plt.show()
 
 # 6. 年龄分布 - 独立图表
-def age_distribution(df):
+def age_distribution(cube):
+    plt = _pyplot()
     plt.figure(figsize=(12, 8))
-    age_bins = [0, 30, 40, 50, 60, 70, 100]
-    age_labels = ['30岁以下', '31-40岁', '41-50岁', '51-60岁', '61-70岁', '70岁以上']
-    df['年龄段'] = pd.cut(df['年龄'], bins=age_bins, labels=age_labels, right=False)
-    age_dist = df['年龄段'].value_counts().sort_index()
+    age_dist = cube.age_counts()
     age_dist.plot(kind='bar', color='teal')
     plt.title('富豪年龄分布', fontsize=15)
     plt.xlabel('年龄段')
@@ -161,9 +227,10 @@ def age_distribution(df):
     plt.show()
 
 # 7. 出生地分布 - 独立图表
-def birthplace_distribution(df):
+def birthplace_distribution(cube):
+    plt = _pyplot()
     plt.figure(figsize=(12, 8))
-    birth_places = df[df['出生地'] != '未知']['出生地'].value_counts().head(10)
+    birth_places = cube.counts('出生地', exclude=['未知']).head(10)
     birth_places.plot(kind='barh', color='orange')
     plt.title('富豪出生地TOP10', fontsize=15)
     plt.xlabel('人数')
@@ -171,23 +238,23 @@ def birthplace_distribution(df):
     plt.savefig('charts/富豪出生地TOP10.png', dpi=300)
     plt.show()
 
-# 8. 财富-年龄关系 - 独立图表
+# 8. 财富-年龄关系 - 独立图表（箱线图需要每个人的财富，直接用原始数据，年龄段临时计算）
 def wealth_age_analysis(df):
+    import seaborn as sns
+    plt = _pyplot()
     plt.figure(figsize=(12, 8))
-    sns.boxplot(x='年龄段', y='财富(亿)', data=df, palette='Set2')
+    sns.boxplot(x=age_band(df['年龄']).rename('年龄段'), y=df['财富(亿)'], palette='Set2')
     plt.title('不同年龄段财富分布', fontsize=15)
     plt.xticks(rotation=30)
     plt.tight_layout()
     plt.savefig('charts/不同年龄段财富分布.png', dpi=300)
     plt.show()
 
-# 9. 行业热力图 - 独立图表
-def industry_heatmap(df):
+# 9. 行业热力图 - 作图只接收 行业 × 年龄段 占比表（由 cube.industry_age_share() 得到）
+def industry_heatmap(industry_age):
+    import seaborn as sns
+    plt = _pyplot()
     plt.figure(figsize=(14, 10))
-    # 选择前15个行业
-    top_industries = df['行业'].value_counts().head(15).index
-    industry_age = pd.crosstab(df[df['行业'].isin(top_industries)]['行业'], 
-                              df['年龄段'], normalize='index')
     sns.heatmap(industry_age, cmap='YlGnBu', annot=True, fmt='.1%')
     plt.title('行业与年龄段热力图', fontsize=15)
     plt.xticks(rotation=30)
@@ -197,6 +264,7 @@ def industry_heatmap(df):
 
 # 10. 财富排名分析 - 独立图表
 def wealth_rank_analysis(df):
+    plt = _pyplot()
     # 图表1：财富分布直方图
     plt.figure(figsize=(12, 6))
     plt.hist(df['财富(亿)'], bins=30, color='steelblue', alpha=0.7)
@@ -219,17 +287,13 @@ def wealth_rank_analysis(df):
     plt.show()
 
 # 11. 生成词云 - 独立图表
-def generate_wordcloud(df):
+def generate_wordcloud(df, processes=1):
+    from wordcloud import WordCloud
+    from company_tokens import word_frequencies
+    plt = _pyplot()
     plt.figure(figsize=(14, 10))
-    # 提取公司名称
-    companies = ' '.join(df['公司'].dropna().astype(str))
-    
-    # 使用jieba分词
-    words = jieba.lcut(companies)
-    word_count = Counter(words)
-    
-    # 过滤单字
-    filtered_words = {word: count for word, count in word_count.items() if len(word) > 1}
+    # 公司名称分词（按名称缓存，只对新名称调用jieba），过滤单字
+    filtered_words = word_frequencies(df['公司'], processes=processes).to_dict()
     
     # 生成词云
     wc = WordCloud(
@@ -248,13 +312,11 @@ def generate_wordcloud(df):
     plt.show()
 
 # 12. 富豪地理分布 - 新增图表
-def geographic_distribution(df):
+def geographic_distribution(cube):
+    plt = _pyplot()
     plt.figure(figsize=(14, 10))
-    # 提取总部所在省份
-    df['省份'] = df['总部'].apply(lambda x: x.split(' ')[0] if isinstance(x, str) else '未知')
-    
-    # 统计各省富豪数量
-    province_count = df[df['省份'] != '未知']['省份'].value_counts().head(15)
+    # 统计各省富豪数量（省份在 parse_data 中由总部的第一个词得到）
+    province_count = cube.counts('省份', exclude=['未知']).head(15)
     
     # 绘制地图式分布
     province_count.plot(kind='bar', color='purple')
@@ -265,40 +327,92 @@ def geographic_distribution(df):
     plt.savefig('charts/富豪地理分布.png', dpi=300)
     plt.show()
 
-# 主函数
-def main():
-    # 爬取数据
+COMMANDS = {
+    'crawl': '爬取并解析榜单，保存为CSV',
+    'charts': '行业、性别、年龄、出生地、财富、地理分布图表',
+    'wordcloud': '公司名称词云',
+    'history': '把榜单按年份存入历史库，并与上一年对比排名和财富变化',
+    'all': '爬取并执行全部分析（默认）',
+}
+
+def crawl(list_ids=None, page_size=200, max_workers=4):
+    # 爬取数据，每页到达后立即解析
     print("正在爬取胡润百富榜数据...")
-    raw_data = fetch_hurun_data()
+    df, failed = fetch_hurun_data(list_ids, page_size=page_size, max_workers=max_workers)
     
-    if raw_data is None:
+    if df is None:
         print("数据获取失败，程序终止")
-        return
-    
-    # 解析数据
-    print("解析数据...")
-    df = parse_data(raw_data)
+        return None
+    if failed:
+        # 榜单不完整时不覆盖本地CSV，避免之后的分析悄悄使用截断的数据
+        print(f"有 {len(failed)} 页重试后仍获取失败，榜单不完整，未保存 '{DATA_FILE}'，请稍后重新运行 crawl")
+        return None
     
     # 显示基本信息
     print(f"\n共爬取 {len(df)} 位富豪数据")
     print("\n数据示例:")
     print_formatted_data(df.head())
     
+    # 保存数据
+    df.to_csv(DATA_FILE, index=False, encoding='utf_8_sig')
+    print(f"\n数据已保存为 '{DATA_FILE}'")
+    return df
+
+def load_data(**crawl_args):
+    """已有CSV时直接读取，否则先爬取"""
+    if os.path.exists(DATA_FILE):
+        print(f"加载本地数据文件 {DATA_FILE}...")
+        return typed_frame(pd.read_csv(DATA_FILE))
+    return crawl(**crawl_args)
+
+def update_history(df, years, list_ids=None):
+    """把榜单存入多年历史库：多个榜单时按 --num 的顺序对应 --year，然后与库中上一年对比
+
+    df 只含一个榜单（没有 '榜单' 列）时对应 years[0]；获取失败的榜单不入库
+    """
+    from hurun_history import HurunHistory
+    history = HurunHistory()
+    ingested = []
+    if '榜单' in df.columns:
+        list_years = dict(zip(list_ids or DEFAULT_LIST_IDS, years))
+        for list_id, frame in df.groupby('榜单', sort=False):
+            history.ingest(frame.drop(columns='榜单'), list_years[list_id])
+            ingested.append(list_years[list_id])
+    else:
+        history.ingest(df, years[0])
+        ingested.append(years[0])
+    print(f"\n本次入库的年份: {sorted(ingested)}，历史库中的年份: {history.years}")
+    
+    latest = max(ingested)
+    earlier = [year for year in history.years if year < latest]
+    if not earlier:
+        return
+    diff = history.diff(earlier[-1], latest)
+    status = diff['状态'].value_counts()
+    print(f"{earlier[-1]} -> {latest}: 新上榜 {status.get('新上榜', 0)} 人，"
+          f"落榜 {status.get('落榜', 0)} 人，连续在榜 {status.get('在榜', 0)} 人")
+    print("\n排名上升最多的10人:")
+    print_formatted_data(diff[diff['状态'] == '在榜'].sort_values('排名变化', ascending=False), num_rows=10)
+
+def draw_charts(df):
+    # 只聚合一次，计数类图表都从立方体切片
+    cube = HurunCube(df)
+    
     # 行业分析
     print("\n正在进行行业分析...")
-    industry_analysis(df)
+    industry_analysis(cube)
     
     # 性别分布
     print("\n分析性别分布...")
-    gender_distribution(df)
+    gender_distribution(cube)
     
     # 年龄分布
     print("\n分析年龄分布...")
-    age_distribution(df)
+    age_distribution(cube)
     
     # 出生地分布
     print("\n分析出生地分布...")
-    birthplace_distribution(df)
+    birthplace_distribution(cube)
     
     # 财富-年龄关系
     print("\n分析财富与年龄关系...")
@@ -306,7 +420,7 @@ def main():
     
     # 行业热力图
     print("\n分析行业与年龄关系...")
-    industry_heatmap(df)
+    industry_heatmap(cube.industry_age_share())
     
     # 财富排名分析
     print("\n进行财富排名分析...")
@@ -314,16 +428,61 @@ def main():
     
     # 地理分布
     print("\n分析地理分布...")
-    geographic_distribution(df)
+    geographic_distribution(cube)
+
+# 主函数
+def main():
+    parser = argparse.ArgumentParser(
+        description='胡润百富榜爬取与分析',
+        epilog='子命令: ' + '；'.join(f'{name} {desc}' for name, desc in COMMANDS.items()))
+    parser.add_argument('command', nargs='?', default='all', choices=list(COMMANDS), help='要执行的阶段')
+    parser.add_argument('--num', nargs='+', default=None,
+                        help=f'榜单ID（接口的 num 参数），可指定多个，默认 {DEFAULT_LIST_IDS[0]}')
+    parser.add_argument('--year', nargs='+', type=int, default=[2024],
+                        help='history 子命令中各榜单对应的年份，与 --num 顺序一致')
+    parser.add_argument('--page-size', type=int, default=200, help='每页条数')
+    parser.add_argument('--workers', type=int, default=4, help='并发请求数')
+    parser.add_argument('--processes', type=int, default=1, help='公司名称分词的进程数（只用于未缓存的名称）')
+    args = parser.parse_args()
+    run(args.command, years=args.year, processes=args.processes,
+        list_ids=args.num, page_size=args.page_size, max_workers=args.workers)
+
+def run_history(years, list_ids=None, page_size=200, max_workers=4):
+    """history 子命令：指定了 --num 时直接爬取这些榜单（不覆盖本地CSV），否则使用默认榜单的数据"""
+    if len(years) != len(list_ids or DEFAULT_LIST_IDS):
+        print(f"--year 的个数（{len(years)}）必须与榜单个数（{len(list_ids or DEFAULT_LIST_IDS)}）一致")
+        return
+    if list_ids:
+        print("正在爬取指定的榜单...")
+        df, failed = fetch_hurun_data(list_ids, page_size=page_size, max_workers=max_workers)
+        if failed:
+            print(f"有 {len(failed)} 页重试后仍获取失败，榜单不完整，不存入历史库")
+            return
+    else:
+        df = load_data(page_size=page_size, max_workers=max_workers)
+    if df is None:
+        print("数据获取失败，程序终止")
+        return
+    update_history(df, years, list_ids)
+
+def run(command, years=(2024,), processes=1, **crawl_args):
+    if command == 'history':
+        run_history(years, **crawl_args)
+        return
     
-    # 生成词云
-    print("\n生成公司名称词云...")
-    generate_wordcloud(df)
+    df = crawl(**crawl_args) if command in ('crawl', 'all') else load_data(**crawl_args)
+    if df is None or command == 'crawl':
+        return
+    
+    if command in ('charts', 'all'):
+        draw_charts(df)
+    
+    if command in ('wordcloud', 'all'):
+        # 生成词云
+        print("\n生成公司名称词云...")
+        generate_wordcloud(df, processes)
     
-    # 保存数据
-    df.to_csv('胡润百富榜2024.csv', index=False, encoding='utf_8_sig')
-    print("\n数据已保存为 '胡润百富榜2024.csv'")
     print("所有图表已保存到 'charts' 文件夹")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,45 @@
+"""按终端显示宽度对齐的表格输出
+
+中文等全角字符在终端里占两列，用 len 计算宽度会让含中文的列错位，这里按
+unicodedata.east_asian_width 计算显示宽度（全角、宽字符记 2，组合字符记 0）。
+表格按页生成：每页只取要输出的那几行，逐列取出值转为字符串后计算列宽，
+不扫描整张表，也不逐行构造 Series，预览几百万行的表和预览几行一样快。
+"""
+import unicodedata
+
+MIN_WIDTH = 8
+
+
+def display_width(text):
+    """字符串在终端中占的列数"""
+    width = 0
+    for ch in text:
+        if unicodedata.combining(ch):
+            continue
+        width += 2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1
+    return width
+
+
+def pad(text, width):
+    """按显示宽度在右侧补空格"""
+    return text + ' ' * (width - display_width(text))
+
+
+def format_rows(df):
+    """把一小块 DataFrame 格式化为 表头、分隔线、数据行 的字符串列表"""
+    headers = [str(col) for col in df.columns]
+    columns = [[str(v) for v in df.iloc[:, j].tolist()] for j in range(df.shape[1])]
+    widths = [max([display_width(h), MIN_WIDTH] + [display_width(v) for v in values])
+              for h, values in zip(headers, columns)]
+    header = " | ".join(pad(h, w) for h, w in zip(headers, widths))
+    lines = [header, "-" * display_width(header)]
+    for row in zip(*columns):
+        lines.append(" | ".join(pad(v, w) for v, w in zip(row, widths)))
+    return lines
+
+
+def iter_pages(df, page_size=20, num_rows=None):
+    """逐页生成格式化后的行列表，每页带表头、按该页内容计算列宽；num_rows 为最多输出的行数"""
+    total = len(df) if num_rows is None else min(num_rows, len(df))
+    for start in range(0, total, page_size):
+        yield format_rows(df.iloc[start:min(start + page_size, total)])
@@ -0,0 +1,61 @@
+"""榜单解析、分页合并与不完整爬取的测试
+
+    python -m pytest -q
+"""
+import pandas as pd
+
+import main
+from main import combine_pages, parse_data
+
+CATEGORY_COLUMNS = ['性别', '行业', '出生地', '省份']
+
+
+def make_row(name, gender, industry, headquarters, place='中国-浙江-杭州'):
+    return {
+        'hs_Character': [{
+            'hs_Character_Fullname_Cn': name,
+            'hs_Character_Gender': gender,
+            'hs_Character_Age': '50',
+            'hs_Character_NativePlace_Cn': place,
+        }],
+        'hs_Rank_Rich_Wealth': 100,
+        'hs_Rank_Rich_ComName_Cn': '公司',
+        'hs_Rank_Rich_Industry_Cn': industry,
+        'hs_Rank_Rich_ComHeadquarters_Cn': headquarters,
+        'hs_Rank_Rich_Ranking': 1,
+    }
+
+
+def test_combine_pages_keeps_categories_across_pages():
+    # 两页的类别集合互不相同
+    first = parse_data([make_row('甲', '先生', '房地产', '浙江 杭州')])
+    second = parse_data([make_row('乙', '女士', '互联网', '北京', place='中国-广东-深圳')])
+    df = combine_pages([first, second])
+    for col in CATEGORY_COLUMNS:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+    assert set(df['行业'].cat.categories) == {'房地产', '互联网'}
+    assert df['省份'].tolist() == ['浙江', '北京']
+    assert df['年龄'].dtype == 'Int16'
+
+
+def test_missing_headquarters_keeps_empty_and_province_unknown():
+    rows = [make_row('甲', '先生', '房地产', None), make_row('乙', '女士', '', ''),
+            make_row('丙', '先生', '医药', ' 上海')]
+    df = parse_data(rows)
+    assert df['总部'].tolist()[:2] == ['', '']
+    assert df['省份'].tolist() == ['未知', '未知', '上海']
+    assert df['行业'].tolist()[1] == '未知'
+
+
+def test_crawl_does_not_save_incomplete_list(tmp_path, monkeypatch):
+    # 共 3 页，offset=1 的那一页重试后仍然失败
+    def fake_fetch_page(session, list_id, offset, limit, retries=3, timeout=15):
+        if offset == 1:
+            raise ConnectionError('timeout')
+        return [make_row(f'人{offset}', '先生', '房地产', '北京')], 3
+    monkeypatch.setattr(main, 'fetch_page', fake_fetch_page)
+    monkeypatch.chdir(tmp_path)
+    df, failed = main.fetch_hurun_data(page_size=1, max_workers=2)
+    assert len(df) == 2 and failed == [(main.DEFAULT_LIST_IDS[0], 1)]
+    assert main.crawl(page_size=1, max_workers=2) is None
+    assert not (tmp_path / main.DATA_FILE).exists()
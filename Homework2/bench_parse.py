@@ -0,0 +1,63 @@
+"""月份页面解析后端基准测试
+
+先用 `python crawl.py --save-pages pages --full` 保存原始页面，再运行：
+
+    python bench_parse.py pages --repeat 20
+
+对每个可用后端输出每秒解析行数，并检查各后端的解析结果是否一致。
+"""
+import argparse
+import glob
+import os
+import time
+
+from weather_parser import BACKENDS, available_backends, columns_to_records
+
+
+def load_pages(page_dir):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(page_dir, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench_backend(name, pages, repeat):
+    parse_columns = BACKENDS[name]
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            columns = parse_columns(html)
+            if columns is not None:
+                rows += len(columns_to_records(columns))
+    elapsed = time.perf_counter() - start
+    return rows, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='天气页面解析后端基准测试')
+    parser.add_argument('page_dir', help='保存的月份页面目录')
+    parser.add_argument('--repeat', type=int, default=10, help='每个后端重复解析全部页面的次数')
+    args = parser.parse_args()
+
+    pages = load_pages(args.page_dir)
+    if not pages:
+        print(f'{args.page_dir} 中没有找到 .html 页面')
+        return
+
+    print(f'页面数: {len(pages)}，重复次数: {args.repeat}')
+    print(f"{'后端':<12}{'行数':>10}{'耗时(s)':>10}{'行/秒':>12}")
+    baseline = None
+    for name in available_backends():
+        rows, elapsed = bench_backend(name, pages, args.repeat)
+        print(f'{name:<12}{rows:>10}{elapsed:>10.3f}{rows / elapsed:>12.0f}')
+        result = [columns_to_records(c) for c in map(BACKENDS[name], pages) if c is not None]
+        if baseline is None:
+            baseline = result
+        elif result != baseline:
+            print(f'警告: {name} 的解析结果与 {available_backends()[0]} 不一致')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,154 +1,298 @@
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
+import argparse
+import os
+import threading
 import time
-from datetime import datetime, timedelta
-
-start_month = datetime(2022, 1, 1)
-end_month = datetime(2024, 12, 1)
-month_list = []
-cur_month = start_month
-while cur_month <= end_month:
-    month_list.append(cur_month.strftime('%Y%m'))
-    if cur_month.month == 12:
-        cur_month = datetime(cur_month.year + 1, 1, 1)
-    else:
-        cur_month = datetime(cur_month.year, cur_month.month + 1, 1)
+from datetime import datetime
+from urllib.parse import urlparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from weather_parser import parse_month_page, available_backends
+from storage import save_partitioned
+from weather_clean import parse_dates, parse_temps
+
+# 并发抓取参数：最大并发请求数、同一host每秒最多请求次数
+MAX_WORKERS = 8
+RATE_LIMIT = 2.0
+# 断点续爬：每个月份解析完成后立即落盘到 {CHECKPOINT_DIR}/{城市}/，journal.txt 记录已完成的月份
+CHECKPOINT_DIR = 'checkpoint'
+DEFAULT_CITIES = ['dalian']
 
-records = []
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 }
 
-for month_str in month_list:
-    url = f'https://www.tianqihoubao.com/lishi/dalian/month/{month_str}.html'
-    try:
-        resp = requests.get(url, headers=headers, timeout=10)
-        resp.encoding = 'utf-8'
-        if resp.status_code != 200:
-            print(f"Failed to get {url}, status: {resp.status_code}")
-            time.sleep(1)
-            continue
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        table = soup.find('table', {'class': 'weather-table'})
-        if not table:
-            print(f"No table found for {month_str}")
-            time.sleep(1)
-            continue
-        trs = table.find_all('tr')
-        for tr in trs[1:]:
-            tds = tr.find_all('td')
-            if len(tds) < 4:
-                continue
-            date = tds[0].get_text(strip=True)
-            weather = tds[1].get_text(strip=True)
-            temp = tds[2].get_text(strip=True)
-            wind = tds[3].get_text(strip=True)
-            if not date or not weather or not temp or not wind:
-                continue
-            try:
-                day_weather, night_weather = [x.strip() for x in weather.split('/')]
-            except:
-                day_weather, night_weather = weather, ''
-            try:
-                high_temp, low_temp = [x.replace('℃','').strip() for x in temp.split('/')]
-            except:
-                high_temp, low_temp = '', ''
+
+class HostRateLimiter:
+    """按host限速，同一host相邻两次请求的发出时间间隔不小于 1/rate 秒"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+_local = threading.local()
+
+
+def get_session():
+    """每个工作线程复用一个长连接Session"""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(headers)
+        _local.session = session
+    return session
+
+
+def build_month_list(start_month, end_month):
+    """构造 [start_month, end_month] 之间的月份字符串列表，如 202201"""
+    month_list = []
+    cur_month = start_month
+    while cur_month <= end_month:
+        month_list.append(cur_month.strftime('%Y%m'))
+        if cur_month.month == 12:
+            cur_month = datetime(cur_month.year + 1, 1, 1)
+        else:
+            cur_month = datetime(cur_month.year, cur_month.month + 1, 1)
+    return month_list
+
+
+RECORD_COLUMNS = ['日期', '白天天气', '夜晚天气', '最高温度', '最低温度', '白天风力', '夜晚风力']
+
+
+def fetch_month(city, month_str, limiter, backend='auto', save_dir=None):
+    """抓取并解析某城市单个月份页面，失败时返回 None
+
+    save_dir 不为空时同时保存原始页面，供 bench_parse.py 做解析基准测试
+    """
+    url = f'https://www.tianqihoubao.com/lishi/{city}/month/{month_str}.html'
+    limiter.wait(url)
+    resp = get_session().get(url, timeout=10)
+    resp.encoding = 'utf-8'
+    if resp.status_code != 200:
+        print(f"Failed to get {url}, status: {resp.status_code}")
+        return None
+    if save_dir:
+        with open(os.path.join(save_dir, f'{city}_{month_str}.html'), 'w', encoding='utf-8') as f:
+            f.write(resp.text)
+    records = parse_month_page(resp.text, backend)
+    if records is None:
+        print(f"No table found for {city} {month_str}")
+    return records
+
+
+def crawl_months(tasks, max_workers=MAX_WORKERS, rate=RATE_LIMIT, on_month=None,
+                 backend='auto', save_dir=None):
+    """用线程池并发抓取所有 (城市, 月份)，由 HostRateLimiter 统一控制请求速率
+
+    每个月份解析完成后立即调用 on_month(city, month_str, records)，
+    返回 {(城市, 月份字符串): 记录列表}，抓取失败的月份不在结果中
+    """
+    limiter = HostRateLimiter(rate)
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_month, city, m, limiter, backend, save_dir): (city, m)
+                   for city, m in tasks}
+        for future in as_completed(futures):
+            city, month_str = futures[future]
             try:
-                day_wind, night_wind = [x.strip() for x in wind.split('/')]
-            except:
-                day_wind, night_wind = wind, ''
-            record = {
-                '日期': date,
-                '白天天气': day_weather,
-                '夜晚天气': night_weather,
-                '最高温度': high_temp,
-                '最低温度': low_temp,
-                '白天风力': day_wind,
-                '夜晚风力': night_wind,
-            }
-            records.append(record)
-        print(f"Done: {month_str}")
-    except Exception as e:
-        print(f"Error on {month_str}: {e}")
-    time.sleep(1)
-
-# 爬取2025年1-6月数据
-extra_months = [f'202501', f'202502', f'202503', f'202504', f'202505', f'202506']
-extra_records = []
-for month_str in extra_months:
-    url = f'https://www.tianqihoubao.com/lishi/dalian/month/{month_str}.html'
-    try:
-        resp = requests.get(url, headers=headers, timeout=10)
-        resp.encoding = 'utf-8'
-        if resp.status_code != 200:
-            print(f"Failed to get {url}, status: {resp.status_code}")
-            time.sleep(1)
+                records = future.result()
+            except Exception as e:
+                print(f"Error on {city} {month_str}: {e}")
+                continue
+            if records is not None:
+                if on_month is not None:
+                    on_month(city, month_str, records)
+                results[(city, month_str)] = records
+                print(f"Done: {city} {month_str}")
+    return results
+
+
+def crawl_shard(tasks, max_workers, rate, checkpoint_dir, backend='auto', save_dir=None):
+    """在一个工作进程中抓取一个分片的 (城市, 月份)
+
+    每个进程有自己的线程池和连接池，解析结果直接写入各城市的断点目录，
+    只把完成的任务列表返回给主进程
+    """
+    checkpoints = {}
+
+    def on_month(city, month_str, records):
+        if city not in checkpoints:
+            checkpoints[city] = MonthCheckpoint(os.path.join(checkpoint_dir, city))
+        checkpoints[city].save(month_str, records)
+
+    results = crawl_months(tasks, max_workers=max_workers, rate=rate, on_month=on_month,
+                           backend=backend, save_dir=save_dir)
+    return sorted(results)
+
+
+def shard_by_city(tasks, n_shards):
+    """按城市把任务分到 n_shards 个分片，同一城市只在一个进程中写断点，分片间任务数尽量均衡"""
+    by_city = {}
+    for city, month_str in tasks:
+        by_city.setdefault(city, []).append((city, month_str))
+    shards = [[] for _ in range(n_shards)]
+    for city_tasks in sorted(by_city.values(), key=len, reverse=True):
+        min(shards, key=len).extend(city_tasks)
+    return [shard for shard in shards if shard]
+
+
+class MonthCheckpoint:
+    """按月份落盘的断点存储
+
+    每个月份的记录写入 {dir}/{YYYYMM}.csv（先写临时文件再原子替换），
+    写完后在 journal.txt 追加一行月份字符串，崩溃后重跑只需补抓缺失月份
+    """
+    def __init__(self, directory=CHECKPOINT_DIR):
+        self.directory = directory
+        self.journal_path = os.path.join(directory, 'journal.txt')
+        os.makedirs(directory, exist_ok=True)
+
+    def month_path(self, month_str):
+        return os.path.join(self.directory, f'{month_str}.csv')
+
+    def done_months(self):
+        if not os.path.exists(self.journal_path):
+            return set()
+        with open(self.journal_path, encoding='utf-8') as f:
+            done = {line.strip() for line in f if line.strip()}
+        # 只认数据文件确实存在的月份
+        return {m for m in done if os.path.exists(self.month_path(m))}
+
+    def save(self, month_str, records):
+        path = self.month_path(month_str)
+        tmp_path = path + '.tmp'
+        pd.DataFrame(records, columns=RECORD_COLUMNS).to_csv(tmp_path, index=False, encoding='utf-8')
+        os.replace(tmp_path, path)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(month_str + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self, month_str):
+        path = self.month_path(month_str)
+        if not os.path.exists(path):
+            return []
+        return pd.read_csv(path, dtype=str, keep_default_na=False).to_dict('records')
+
+    def pending(self, months, current_month=None):
+        """返回需要抓取的月份：未完成的月份，以及数据仍在变化的当前及之后月份"""
+        if current_month is None:
+            current_month = datetime.now().strftime('%Y%m')
+        done = self.done_months()
+        return [m for m in months if m not in done or m >= current_month]
+
+
+def to_typed_frame(df):
+    """把原始字符串列转换为带类型的列：日期为datetime，最高/最低温度为float"""
+    df = df.copy()
+    df['日期'] = parse_dates(df['日期'])
+    for col in ['最高温度', '最低温度']:
+        df[col] = parse_temps(df[col])
+    return df
+
+
+def load_city_frame(checkpoint, city, months):
+    """从断点目录读取某城市若干月份的记录，返回带类型且含 city、year 列的DataFrame"""
+    frames = []
+    for month_str in months:
+        records = checkpoint.load(month_str)
+        if records:
+            frame = pd.DataFrame(records, columns=RECORD_COLUMNS)
+            frame['月份'] = month_str
+            frames.append(frame)
+    if not frames:
+        return None
+    df = to_typed_frame(pd.concat(frames, ignore_index=True))
+    df['city'] = city
+    df['year'] = df['月份'].str[:4].astype(int)
+    return df
+
+
+def read_cities(args):
+    cities = list(args.cities)
+    if args.city_file:
+        with open(args.city_file, encoding='utf-8') as f:
+            cities.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    # 去重并保持顺序
+    return list(dict.fromkeys(cities)) or DEFAULT_CITIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description='爬取多个城市的历史天气数据')
+    parser.add_argument('--cities', nargs='*', default=[], help='城市拼音列表，如 dalian shenyang，默认 dalian')
+    parser.add_argument('--city-file', default=None, help='城市列表文件，每行一个城市拼音')
+    parser.add_argument('--processes', type=int, default=None, help='工作进程数，默认不超过城市数和CPU核数')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help='每个进程的最大并发请求数')
+    parser.add_argument('--rate', type=float, default=RATE_LIMIT, help='同一host每秒最多请求次数（所有进程合计），0表示不限速')
+    parser.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR, help='断点数据目录')
+    parser.add_argument('--full', action='store_true', help='忽略已完成记录，重新抓取全部月份')
+    parser.add_argument('--parser', default='auto', choices=['auto'] + available_backends(),
+                        help='页面解析后端，auto 表示选用可用的最快后端')
+    parser.add_argument('--save-pages', default=None, help='保存原始页面的目录，供解析基准测试使用')
+    parser.add_argument('--excel', action='store_true', help='除Parquet外另外导出一份Excel文件')
+    args = parser.parse_args()
+
+    cities = read_cities(args)
+    month_list = build_month_list(datetime(2022, 1, 1), datetime(2024, 12, 1))
+    # 2025年1-6月数据与历史数据走同一个调度器
+    extra_months = [f'202501', f'202502', f'202503', f'202504', f'202505', f'202506']
+    all_months = month_list + extra_months
+
+    checkpoints = {city: MonthCheckpoint(os.path.join(args.checkpoint_dir, city)) for city in cities}
+    tasks = []
+    for city in cities:
+        pending = all_months if args.full else checkpoints[city].pending(all_months)
+        tasks.extend((city, m) for m in pending)
+    print(f"{len(cities)} 个城市，需要抓取 {len(tasks)}/{len(cities) * len(all_months)} 个月份")
+
+    start = time.perf_counter()
+    processes = args.processes or min(len(cities), os.cpu_count() or 1)
+    shards = shard_by_city(tasks, max(processes, 1))
+    done = []
+    if len(shards) <= 1:
+        for shard in shards:
+            done.extend(crawl_shard(shard, args.workers, args.rate, args.checkpoint_dir, args.parser, args.save_pages))
+    else:
+        # 所有进程访问同一个host，速率上限按进程数均分
+        shard_rate = args.rate / len(shards)
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [executor.submit(crawl_shard, shard, args.workers, shard_rate, args.checkpoint_dir,
+                                       args.parser, args.save_pages) for shard in shards]
+            for future in as_completed(futures):
+                done.extend(future.result())
+    print(f"共抓取 {len(done)}/{len(tasks)} 个月份，耗时 {time.perf_counter() - start:.1f}s")
+
+    for city in cities:
+        df = load_city_frame(checkpoints[city], city, all_months)
+        if df is None:
+            print(f'未获取到 {city} 的任何数据')
             continue
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        table = soup.find('table', {'class': 'weather-table'})
-        if not table:
-            print(f"No table found for {month_str}")
-            time.sleep(1)
+        path = save_partitioned(df.drop(columns=['月份']), 'weather', ['city', 'year'], excel=args.excel)
+        print(f'{city} 数据已按年份保存到 {path}')
+
+        extra_df = df[df['月份'].isin(extra_months)].copy()
+        if extra_df.empty:
+            print(f'未获取到 {city} 2025年1-6月数据')
             continue
-        trs = table.find_all('tr')
-        for tr in trs[1:]:
-            tds = tr.find_all('td')
-            if len(tds) < 4:
-                continue
-            date = tds[0].get_text(strip=True)
-            weather = tds[1].get_text(strip=True)
-            temp = tds[2].get_text(strip=True)
-            wind = tds[3].get_text(strip=True)
-            if not date or not weather or not temp or not wind:
-                continue
-            try:
-                day_weather, night_weather = [x.strip() for x in weather.split('/')]
-            except:
-                day_weather, night_weather = weather, ''
-            try:
-                high_temp, low_temp = [x.replace('℃','').strip() for x in temp.split('/')]
-            except:
-                high_temp, low_temp = '', ''
-            try:
-                day_wind, night_wind = [x.strip() for x in wind.split('/')]
-            except:
-                day_wind, night_wind = wind, ''
-            record = {
-                '日期': date,
-                '白天天气': day_weather,
-                '夜晚天气': night_weather,
-                '最高温度': high_temp,
-                '最低温度': low_temp,
-                '白天风力': day_wind,
-                '夜晚风力': night_wind,
-                '月份': month_str
-            }
-            extra_records.append(record)
-        print(f"Done: {month_str}")
-    except Exception as e:
-        print(f"Error on {month_str}: {e}")
-    time.sleep(1)
-
-if extra_records:
-    extra_df = pd.DataFrame(extra_records)
-    def to_num(x):
-        try:
-            return float(str(x).replace('℃','').replace(' ',''))
-        except:
-            return None
-    extra_df['最高温度'] = extra_df['最高温度'].astype(str).apply(to_num)
-    extra_df['month'] = extra_df['月份'].str[-2:].astype(int)
-    avg_temp = extra_df.groupby('month')['最高温度'].mean().reset_index()
-    avg_temp = avg_temp.rename(columns={'最高温度': '平均最高温度'})
-    avg_temp.to_excel('2025_1-6_max_temp.xlsx', index=False)
-    print('2025年1-6月每月平均最高气温已保存为 2025_1-6_max_temp.xlsx')
-else:
-    print('未获取到2025年1-6月数据')
-
-if records:
-    df = pd.DataFrame(records)
-    df.to_excel('weather_dalian_2022_2024.xlsx', index=False)
-    print('数据已保存为 weather_dalian_2022_2024.xlsx')
-else:
-    print('未获取到任何数据')
+        extra_df['month'] = extra_df['月份'].str[-2:].astype(int)
+        avg_temp = extra_df.groupby(['city', 'month'])['最高温度'].mean().reset_index()
+        avg_temp = avg_temp.rename(columns={'最高温度': '平均最高温度'})
+        path = save_partitioned(avg_temp, '2025_1-6_max_temp', ['city'], excel=args.excel)
+        print(f'{city} 2025年1-6月每月平均最高气温已保存到 {path}')
+
+
+if __name__ == '__main__':
+    main()
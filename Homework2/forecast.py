@@ -0,0 +1,221 @@
+"""月度气温时序预测
+
+DirectForecaster 为未来每个月份各训练一个线性模型（直接多步预测）：
+训练窗口由 sliding_window_view 生成，是原序列上的零拷贝视图；
+全部 horizon 个模型通过一次带岭正则的最小二乘求解同时得到，
+预测时一次矩阵乘法返回未来全部月份，不再逐月递推、误差也不会累积。
+
+RecursiveForecaster 是原来 prediction.py 中的做法（单步线性回归 + 逐月递推），
+保留下来作为 backtest 的对照，也可以用 prediction.py --method recursive 切换回去。
+
+BatchDirectForecaster / forecast_panel 把很多条序列（多个站点 × 多个变量）
+叠成一个二维数组，用批量矩阵运算一起拟合、一起预测；含缺失值无法对齐的序列
+交给进程池逐条处理，最后输出一张预测表。
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 回测中每个起点至少需要的训练样本数
+MIN_WINDOWS = 6
+
+
+def make_windows(series, window, horizon=1):
+    """返回 (X, Y) 两个零拷贝视图：X[i] = series[i:i+window]，Y[i] = series[i+window:i+window+horizon]"""
+    series = np.asarray(series, dtype=float)
+    if len(series) < window + horizon:
+        raise ValueError(f'序列长度 {len(series)} 不足以构造 window={window}、horizon={horizon} 的样本')
+    view = sliding_window_view(series, window + horizon)
+    return view[:, :window], view[:, window:]
+
+
+def fit_linear(X, Y, ridge=0.0):
+    """一次求解 Y ≈ X @ coef + intercept 的所有输出列，返回 (coef, intercept)
+
+    对X、Y去均值后求解，截距不参与正则；ridge=0 时等价于普通最小二乘
+    """
+    x_mean = X.mean(axis=0)
+    y_mean = Y.mean(axis=0)
+    Xc = X - x_mean
+    Yc = Y - y_mean
+    if ridge > 0:
+        gram = Xc.T @ Xc + ridge * np.eye(X.shape[1])
+        coef = np.linalg.solve(gram, Xc.T @ Yc)
+    else:
+        coef = np.linalg.lstsq(Xc, Yc, rcond=None)[0]
+    return coef, y_mean - x_mean @ coef
+
+
+class DirectForecaster:
+    def __init__(self, window=12, horizon=12, ridge=1.0):
+        # 样本数通常只比特征数略多，默认加一点岭正则防止过拟合
+        self.window = window
+        self.horizon = horizon
+        self.ridge = ridge
+
+    def n_windows(self, length):
+        """长度为 length 的序列能构造的训练样本数"""
+        return length - self.window - self.horizon + 1
+
+    def fit(self, series):
+        X, Y = make_windows(series, self.window, self.horizon)
+        self.coef_, self.intercept_ = fit_linear(X, Y, self.ridge)
+        return self
+
+    def predict(self, recent):
+        """用最近 window 个值一次预测未来 horizon 个值"""
+        recent = np.asarray(recent, dtype=float)[-self.window:]
+        return recent @ self.coef_ + self.intercept_
+
+
+class RecursiveForecaster:
+    def __init__(self, window=12, horizon=12):
+        self.window = window
+        self.horizon = horizon
+
+    def n_windows(self, length):
+        """长度为 length 的序列能构造的训练样本数"""
+        return length - self.window
+
+    def fit(self, series):
+        X, Y = make_windows(series, self.window, 1)
+        self.coef_, self.intercept_ = fit_linear(X, Y)
+        return self
+
+    def predict(self, recent):
+        buf = np.empty(self.window + self.horizon)
+        buf[:self.window] = np.asarray(recent, dtype=float)[-self.window:]
+        for i in range(self.horizon):
+            buf[self.window + i] = buf[i:i + self.window] @ self.coef_[:, 0] + self.intercept_[0]
+        return buf[self.window:]
+
+
+def backtest(series, forecasters, min_train=None, min_windows=MIN_WINDOWS):
+    """滚动起点回测
+
+    forecasters 为 {名称: 无参构造函数}。对每个起点 t，用 series[:t] 训练，
+    预测 series[t:t+horizon]（超出序列末尾的部分不计分），
+    返回每种方法在每个预测步长上的 MAE、RMSE 和样本数。
+    起点至少为 min_train，并且每种方法在 series[:t] 上都至少有 min_windows 个训练样本，
+    避免只用一两个窗口拟合的模型参与打分；序列太短时较长的步长可能没有起点，不出现在结果中。
+    """
+    series = np.asarray(series, dtype=float)
+    probes = [factory() for factory in forecasters.values()]
+    # 所有方法使用相同的起点，保证分数可比
+    start = min_train or 1
+    while start < len(series) and any(p.n_windows(start) < min_windows for p in probes):
+        start += 1
+    rows = []
+    for (name, factory), probe in zip(forecasters.items(), probes):
+        errors = [[] for _ in range(probe.horizon)]
+        for t in range(start, len(series)):
+            preds = factory().fit(series[:t]).predict(series[:t])
+            actual = series[t:t + probe.horizon]
+            for h, err in enumerate(preds[:len(actual)] - actual):
+                errors[h].append(err)
+        for h, errs in enumerate(errors, 1):
+            if not errs:
+                continue
+            errs = np.asarray(errs)
+            rows.append({
+                'method': name,
+                'horizon': h,
+                'MAE': np.abs(errs).mean(),
+                'RMSE': np.sqrt((errs ** 2).mean()),
+                'n': len(errs),
+            })
+    return pd.DataFrame(rows)
+
+
+def fit_linear_batch(X, Y, ridge=0.0):
+    """fit_linear 的批量版本：X 形状 (S, n, window)，Y 形状 (S, n, horizon)
+
+    S 条序列的法方程一次批量求解，返回 coef (S, window, horizon) 与 intercept (S, horizon)
+    """
+    x_mean = X.mean(axis=1, keepdims=True)
+    y_mean = Y.mean(axis=1, keepdims=True)
+    Xc = X - x_mean
+    Yc = Y - y_mean
+    if ridge > 0:
+        XcT = Xc.transpose(0, 2, 1)
+        gram = XcT @ Xc + ridge * np.eye(X.shape[2])
+        coef = np.linalg.solve(gram, XcT @ Yc)
+    else:
+        coef = np.linalg.pinv(Xc) @ Yc
+    intercept = y_mean[:, 0, :] - np.einsum('sw,swh->sh', x_mean[:, 0, :], coef)
+    return coef, intercept
+
+
+class BatchDirectForecaster(DirectForecaster):
+    """对形状为 (序列数, 时间长度) 的二维数组中的每一行同时做直接多步预测"""
+
+    def fit(self, panel):
+        panel = np.asarray(panel, dtype=float)
+        if len(panel[0]) < self.window + self.horizon:
+            raise ValueError(f'序列长度 {len(panel[0])} 不足以构造 window={self.window}、horizon={self.horizon} 的样本')
+        view = sliding_window_view(panel, self.window + self.horizon, axis=1)
+        self.coef_, self.intercept_ = fit_linear_batch(view[:, :, :self.window], view[:, :, self.window:], self.ridge)
+        return self
+
+    def predict(self, panel):
+        recent = np.asarray(panel, dtype=float)[:, -self.window:]
+        return np.einsum('sw,swh->sh', recent, self.coef_) + self.intercept_
+
+
+def _forecast_with_gaps(series, window, horizon, ridge):
+    """含缺失值的单条序列：丢弃含缺失值的训练窗口，预测输入中的缺失值用插值补齐"""
+    X, Y = make_windows(series, window, horizon)
+    ok = ~(np.isnan(X).any(axis=1) | np.isnan(Y).any(axis=1))
+    if ok.sum() < 2:
+        return np.full(horizon, np.nan)
+    coef, intercept = fit_linear(X[ok], Y[ok], ridge)
+    recent = pd.Series(series).interpolate(limit_direction='both').to_numpy()[-window:]
+    return recent @ coef + intercept
+
+
+def forecast_panel(wide, window=12, horizon=12, ridge=1.0, workers=None):
+    """批量预测宽表中的每一条序列，返回一张长格式预测表
+
+    wide 的每一行是一条序列（索引为序列标识，如 城市、变量），每一列是一个月份（pd.Period）。
+    没有缺失值的序列叠成二维数组一次拟合和预测；含缺失值的序列分发到进程池逐条处理。
+    返回列：序列标识列 + step、period、forecast。
+    """
+    values = wide.to_numpy(dtype=float)
+    preds = np.full((len(values), horizon), np.nan)
+    complete = ~np.isnan(values).any(axis=1)
+    if complete.any():
+        model = BatchDirectForecaster(window, horizon, ridge).fit(values[complete])
+        preds[complete] = model.predict(values[complete])
+    gaps = np.flatnonzero(~complete)
+    if len(gaps):
+        print(f'{len(gaps)} 条序列含缺失值，使用进程池逐条拟合')
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_forecast_with_gaps, values[gaps], repeat(window), repeat(horizon), repeat(ridge))
+            for i, pred in zip(gaps, results):
+                preds[i] = pred
+
+    keys = list(wide.index.names)
+    table = pd.concat([wide.index.to_frame(index=False),
+                       pd.DataFrame(preds, columns=range(1, horizon + 1))], axis=1)
+    table = table.melt(id_vars=keys, var_name='step', value_name='forecast')
+    table = table.sort_values(keys + ['step'], kind='stable').reset_index(drop=True)
+    last_period = wide.columns[-1]
+    table['period'] = [str(last_period + step) for step in table['step']]
+    return table
+
+
+def monthly_panel(df, keys, variables):
+    """把清洗后的逐日数据整理成宽表：每行一条 (keys..., variable) 序列，每列一个月份
+
+    缺失的月份保留为 NaN，交给 forecast_panel 的进程池路径处理
+    """
+    period = df['日期'].dt.to_period('M').rename('period')
+    long = df[keys + variables].assign(period=period).melt(
+        id_vars=keys + ['period'], value_vars=variables, var_name='variable')
+    wide = long.pivot_table(index=keys + ['variable'], columns='period', values='value',
+                            aggfunc='mean', observed=True)
+    full_range = pd.period_range(wide.columns.min(), wide.columns.max(), freq='M')
+    return wide.reindex(columns=full_range)
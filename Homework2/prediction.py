@@ -1,52 +1,115 @@
 import os
+import argparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
+from storage import load_partitioned, save_table
+from weather_clean import clean_weather, wind_level_value
+from forecast import DirectForecaster, RecursiveForecaster, backtest, monthly_panel, forecast_panel
 
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'Arial Unicode MS']
 plt.rcParams['axes.unicode_minus'] = False
 
-temp_df = pd.read_excel('year_month_max_temp.xlsx')
-real2025_df = pd.read_excel('2025_1-6_max_temp.xlsx')
-
-temp_series = temp_df['平均最高气温'].values
-
-def create_dataset(series, window=12):
-    X, y = [], []
-    for i in range(len(series) - window):
-        X.append(series[i:i+window])
-        y.append(series[i+window])
-    return np.array(X), np.array(y)
-
-X, y = create_dataset(temp_series, window=12)
-
-model = LinearRegression()
-model.fit(X, y)
-
-# 预测2025年1-12月
-test_input = temp_series[-12:]
-preds = []
-for i in range(12):
-    pred = model.predict(test_input[-12:].reshape(1, -1))[0]
-    preds.append(pred)
-    test_input = np.append(test_input, pred)
-
-y_true = real2025_df['平均最高温度'].values if '平均最高温度' in real2025_df.columns else real2025_df['平均最高气温'].values
-
-# 可视化
-os.makedirs('results', exist_ok=True)
-months = [f'2025-{i:02d}' for i in range(1, 13)]
-plt.figure(figsize=(10,6))
-plt.plot(months, preds, marker='o', label='预测值')
-plt.plot(months[:6], y_true, marker='o', label='真实值')
-plt.xlabel('月份')
-plt.ylabel('平均最高气温 (℃)')
-plt.title('2025年1-12月平均最高气温预测与前6个月真实对比')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('results/pred_vs_real_2025_full.png')
-plt.close()
-
-print('2025年1-12月预测与前6个月真实对比折线图已保存到 results/pred_vs_real_2025_full.png')
+# 批量模式下参与预测的变量
+BATCH_VARIABLES = ['最高温度', '最低温度', '风力等级']
+
+
+FORECASTERS = {'direct': DirectForecaster, 'recursive': RecursiveForecaster}
+
+
+def predict_single(city='dalian', method='direct'):
+    """预测某城市的月平均最高气温，并与2025年前6个月真实值对比作图
+
+    method 为 direct（默认，直接多步预测）或 recursive（原来的单步模型逐月递推）
+    """
+    is_default = city == 'dalian'
+    temp_df = load_partitioned('year_month_max_temp', filters={'city': [city]},
+                               legacy='year_month_max_temp' if is_default else None)
+    temp_df = temp_df.sort_values(['year', 'month'])
+    real2025_df = load_partitioned('2025_1-6_max_temp', filters={'city': [city]},
+                                   legacy='2025_1-6_max_temp' if is_default else None)
+    real2025_df = real2025_df.sort_values('month')
+
+    temp_series = temp_df['平均最高气温'].values
+
+    # 直接多步预测：一次求解12个步长的模型，一次调用得到2025年1-12月
+    model = FORECASTERS[method](window=12, horizon=12).fit(temp_series)
+    preds = model.predict(temp_series)
+
+    y_true = real2025_df['平均最高温度'].values if '平均最高温度' in real2025_df.columns else real2025_df['平均最高气温'].values
+
+    # 两种方法对比：历史数据上的滚动回测，以及2025年已知月份上的误差
+    scores = backtest(temp_series, FORECASTERS)
+    if len(scores):
+        print('滚动回测各步长误差：')
+        print(scores.pivot(index='horizon', columns='method', values='MAE').round(2))
+    else:
+        print('序列太短，没有满足最少训练样本数的回测起点')
+    for name, factory in FORECASTERS.items():
+        p = preds if name == method else factory(window=12, horizon=12).fit(temp_series).predict(temp_series)
+        print(f'{name} 2025年1-{len(y_true)}月 MAE: {np.abs(p[:len(y_true)] - y_true).mean():.2f}')
+
+    # 可视化
+    out_dir = 'results' if is_default else os.path.join('results', city)
+    os.makedirs(out_dir, exist_ok=True)
+    months = [f'2025-{i:02d}' for i in range(1, 13)]
+    plt.figure(figsize=(10,6))
+    plt.plot(months, preds, marker='o', label='预测值')
+    plt.plot(months[:len(y_true)], y_true, marker='o', label='真实值')
+    plt.xlabel('月份')
+    plt.ylabel('平均最高气温 (℃)')
+    plt.title('2025年1-12月平均最高气温预测与前6个月真实对比')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    out_path = os.path.join(out_dir, 'pred_vs_real_2025_full.png')
+    plt.savefig(out_path)
+    plt.close()
+
+    print(f'2025年1-12月预测与前6个月真实对比折线图已保存到 {out_path}')
+
+
+def predict_batch(cities=None, start_year=2022, end_year=2024, workers=None, excel=False):
+    """把所有序列（城市 × 变量）叠在一起批量预测未来12个月，输出一张预测表
+
+    cities 为空时读取全部城市，只打开所需城市、年份的分区
+    """
+    filters = {'year': list(range(start_year, end_year + 1))}
+    if cities:
+        filters['city'] = cities
+    raw = load_partitioned('weather', filters=filters,
+                           legacy='weather_dalian_2022_2024' if cities in (None, [], ['dalian']) else None)
+    if 'city' not in raw.columns:
+        raw['city'] = 'dalian'
+    df = clean_weather(raw)
+    df = df[df['year'].between(start_year, end_year)]
+    df['风力等级'] = pd.concat([wind_level_value(df['白天风力']),
+                            wind_level_value(df['夜晚风力'])], axis=1).mean(axis=1)
+    wide = monthly_panel(df, ['city'], BATCH_VARIABLES)
+    table = forecast_panel(wide, window=12, horizon=12, workers=workers)
+    path = save_table(table, 'forecast_table', excel=excel)
+    print(f'共预测 {len(wide)} 条序列，预测表已保存为 {path}')
+    print(table.pivot_table(index='period', columns=wide.index.names, values='forecast').round(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='月度气温预测')
+    parser.add_argument('--batch', action='store_true', help='批量预测所有城市、所有变量序列，输出一张预测表')
+    parser.add_argument('--city', nargs='*', default=None,
+                        help='城市过滤；单序列模式取第一个城市（默认 dalian），批量模式默认全部城市')
+    parser.add_argument('--start-year', type=int, default=2022, help='批量模式训练数据起始年份')
+    parser.add_argument('--end-year', type=int, default=2024, help='批量模式训练数据结束年份')
+    parser.add_argument('--method', choices=list(FORECASTERS), default='direct',
+                        help='单序列模式的预测方法：direct 直接多步预测（默认），recursive 逐月递推')
+    parser.add_argument('--workers', type=int, default=None, help='含缺失值序列使用的进程数')
+    parser.add_argument('--excel', action='store_true', help='除Parquet外另外导出一份Excel文件')
+    args = parser.parse_args()
+
+    if args.batch:
+        predict_batch(args.city, args.start_year, args.end_year, workers=args.workers, excel=args.excel)
+    else:
+        predict_single(args.city[0] if args.city else 'dalian', method=args.method)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Homework2 各脚本之间传递数据的列式存储
+
+crawl.py、visual.py、prediction.py 之间的中间结果以 Parquet 为主格式保存，
+读取时内存映射、保留列类型；Excel 只作为可选的附带导出，便于人工查看。
+旧版本只生成了 .xlsx 的，读取时自动回退到 Excel。
+
+多城市数据按 data/{name}/city=.../year=.../part-0.parquet 分区保存，
+读取时按城市、年份过滤，只打开需要的分区文件。
+"""
+import os
+import pandas as pd
+import pyarrow.dataset as ds
+
+DATA_DIR = 'data'
+
+
+def table_path(name, ext='parquet'):
+    return f'{name}.{ext}'
+
+
+def save_table(df, name, excel=False):
+    """保存为 {name}.parquet，excel=True 时另外导出 {name}.xlsx，返回主文件路径"""
+    path = table_path(name)
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, engine='pyarrow', index=False)
+    os.replace(tmp_path, path)
+    if excel:
+        df.to_excel(table_path(name, 'xlsx'), index=False)
+    return path
+
+
+def load_table(name, columns=None):
+    """优先读取 {name}.parquet（内存映射），不存在时回退读取 {name}.xlsx"""
+    path = table_path(name)
+    if os.path.exists(path):
+        return pd.read_parquet(path, engine='pyarrow', columns=columns, memory_map=True)
+    xlsx_path = table_path(name, 'xlsx')
+    if os.path.exists(xlsx_path):
+        print(f'未找到 {path}，回退读取 {xlsx_path}')
+        return pd.read_excel(xlsx_path, usecols=columns)
+    raise FileNotFoundError(f'找不到数据文件 {path} 或 {xlsx_path}')
+
+
+def dataset_path(name):
+    return os.path.join(DATA_DIR, name)
+
+
+def save_partitioned(df, name, partition_cols, excel=False):
+    """按 partition_cols 分区保存，每个分区覆盖写入一个 part-0.parquet，返回数据集目录
+
+    只重写 df 中出现的分区，其他城市、年份的分区保持不变；
+    excel=True 时每个分区另外导出 data/{name}_{分区值...}.xlsx
+    """
+    root = dataset_path(name)
+    for keys, part in df.groupby(partition_cols, observed=True, sort=False):
+        if not isinstance(keys, tuple):
+            keys = (keys,)
+        part_dir = os.path.join(root, *[f'{col}={key}' for col, key in zip(partition_cols, keys)])
+        os.makedirs(part_dir, exist_ok=True)
+        # 临时文件以 . 开头，读取数据集时会被忽略
+        tmp_path = os.path.join(part_dir, '.part-0.parquet.tmp')
+        part = part.drop(columns=partition_cols)
+        part.to_parquet(tmp_path, engine='pyarrow', index=False)
+        os.replace(tmp_path, os.path.join(part_dir, 'part-0.parquet'))
+        if excel:
+            suffix = '_'.join(str(key) for key in keys)
+            part.to_excel(os.path.join(DATA_DIR, f'{name}_{suffix}.xlsx'), index=False)
+    return root
+
+
+def load_partitioned(name, filters=None, columns=None, legacy=None):
+    """读取分区数据集，filters 形如 {'city': ['dalian'], 'year': [2022, 2023]}
+
+    过滤条件作用在分区目录上，不匹配的分区文件不会被打开；
+    数据集不存在且给出 legacy 时，回退读取旧版单文件 load_table(legacy)
+    """
+    root = dataset_path(name)
+    if not os.path.isdir(root):
+        if legacy is not None:
+            print(f'未找到 {root}，回退读取旧版单文件 {legacy}')
+            return load_table(legacy, columns)
+        raise FileNotFoundError(f'找不到数据集 {root}')
+    dataset = ds.dataset(root, format='parquet', partitioning='hive')
+    expr = None
+    for col, values in (filters or {}).items():
+        cond = ds.field(col).isin(list(values))
+        expr = cond if expr is None else expr & cond
+    return dataset.to_table(filter=expr, columns=columns).to_pandas()
@@ -1,46 +1,39 @@
 import os
-import pandas as pd
+import argparse
 import matplotlib.pyplot as plt
 import seaborn as sns
-from matplotlib.font_manager import FontProperties
-import re
+from storage import load_partitioned, save_partitioned
+from weather_clean import clean_weather
+from weather_cube import WeatherCube
 
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'Arial Unicode MS']
 plt.rcParams['axes.unicode_minus'] = False
 
-df = pd.read_excel('weather_dalian_2022_2024.xlsx')
+CITY_NAMES = {'dalian': '大连市'}
 
-if '日期' in df.columns:
-    df = df[df['日期'].notnull()]
-    def parse_date(s):
-        s = str(s)
-        s = re.sub(r'[年月]', '-', s)
-        s = re.sub(r'[日.]', '', s)
-        s = s.strip('-')
-        try:
-            return pd.to_datetime(s, format='%Y-%m-%d', errors='coerce')
-        except:
-            return pd.to_datetime(s, errors='coerce')
-    df['日期'] = df['日期'].apply(parse_date)
-    df = df[df['日期'].notnull()]
-    df['year'] = df['日期'].dt.year
-    df['month'] = df['日期'].dt.month
-else:
-    raise ValueError('数据表缺少"日期"列')
+parser = argparse.ArgumentParser(description='天气数据统计与可视化')
+parser.add_argument('--city', default='dalian', help='城市拼音，只读取该城市的分区数据')
+parser.add_argument('--start-year', type=int, default=2022, help='起始年份')
+parser.add_argument('--end-year', type=int, default=2024, help='结束年份')
+parser.add_argument('--out', default=None, help='图表输出目录，默认大连为 results，其他城市为 results/<城市>')
+parser.add_argument('--excel', action='store_true', help='除Parquet外另外导出一份Excel文件')
+args = parser.parse_args()
 
-# 任务2
-def to_num(x):
-    try:
-        return float(str(x).replace('℃','').replace(' ',''))
-    except:
-        return None
+city_name = CITY_NAMES.get(args.city, args.city)
+out_dir = args.out or ('results' if args.city == 'dalian' else os.path.join('results', args.city))
+years = list(range(args.start_year, args.end_year + 1))
 
-df['最高温度'] = df['最高温度'].astype(str).apply(to_num)
-df['最低温度'] = df['最低温度'].astype(str).apply(to_num)
+# 任务1：只读取所需城市、年份的分区，整列清洗得到带类型的数据，后续统计与绘图都复用它
+raw = load_partitioned('weather', filters={'city': [args.city], 'year': years},
+                       legacy='weather_dalian_2022_2024' if args.city == 'dalian' else None)
+df = clean_weather(raw)
+df = df[df['year'].between(args.start_year, args.end_year)]
+# 一次聚合得到 月 × 风力等级 × 天气 的计数立方体，下面所有图表都从它切片
+cube = WeatherCube(df)
 
-os.makedirs('results', exist_ok=True)
+os.makedirs(out_dir, exist_ok=True)
 
-monthly_temp = df.groupby('month').agg({'最高温度':'mean', '最低温度':'mean'}).reset_index()
+monthly_temp = cube.monthly_temp()
 if not monthly_temp.empty:
     plt.figure(figsize=(10,6))
     plt.plot(monthly_temp['month'], monthly_temp['最高温度'], marker='o', label='平均最高温度')
@@ -48,54 +41,36 @@ if not monthly_temp.empty:
     plt.xticks(range(1,13))
     plt.xlabel('月份')
     plt.ylabel('温度 (℃)')
-    plt.title('大连市近三年月平均气温变化')
+    plt.title(f'{city_name}{args.start_year}-{args.end_year}年月平均气温变化')
     plt.legend()
     plt.grid(True)
     plt.tight_layout()
-    plt.savefig('results/monthly_temp_trend.png')
+    plt.savefig(os.path.join(out_dir, 'monthly_temp_trend.png'))
     plt.close()
 else:
     print('月平均气温数据为空，未生成气温变化图。')
 
-year_month_temp = df.groupby(['year', 'month'])['最高温度'].mean().reset_index()
+year_month_temp = cube.year_month_temp()[['year', 'month', '最高温度']]
 year_month_temp = year_month_temp.rename(columns={'最高温度': '平均最高气温'})
-year_month_temp.to_excel('year_month_max_temp.xlsx', index=False)
+year_month_temp['city'] = args.city
+year_month_temp_path = save_partitioned(year_month_temp, 'year_month_max_temp', ['city'], excel=args.excel)
 
 # 任务3
-def extract_wind_level(w):
-    match = re.search(r'(\d+\s*[-~]\s*\d+级|\d+级)', str(w))
-    return match.group(1).replace(' ', '') if match else None
-
-for col in ['白天风力', '夜晚风力']:
-    df[col] = df[col].astype(str).apply(extract_wind_level)
-
 for m in range(1, 13):
-    month_df = df[df['month'] == m]
-    wind_levels = pd.concat([
-        month_df['白天风力'].dropna(),
-        month_df['夜晚风力'].dropna()
-    ])
-    wind_counts = wind_levels.value_counts().sort_index()
+    wind_counts = cube.wind_counts(m)
     if not wind_counts.empty:
         plt.figure(figsize=(6,6))
         plt.pie(wind_counts, labels=wind_counts.index, autopct='%1.1f%%', startangle=90, counterclock=False)
         plt.title(f'{m}月风力等级分布')
         plt.tight_layout()
-        plt.savefig(f'results/wind_pie_{m:02d}.png')
+        plt.savefig(os.path.join(out_dir, f'wind_pie_{m:02d}.png'))
         plt.close()
     else:
         print(f'{m}月风力数据为空，未生成饼图。')
 
 # 任务4
-weather_df = pd.DataFrame()
-weather_df['month'] = df['month']
-weather_df['白天天气'] = df['白天天气'].astype(str).str.strip()
-weather_df['夜晚天气'] = df['夜晚天气'].astype(str).str.strip()
-weather_long = pd.melt(weather_df, id_vars=['month'], value_vars=['白天天气','夜晚天气'], var_name='时段', value_name='天气')
-weather_long = weather_long[weather_long['天气'].notnull() & (weather_long['天气'] != '')]
-weather_count = weather_long.groupby(['month','天气']).size().reset_index(name='天数')
-weather_count['平均天数'] = weather_count['天数'] / 3
-weather_count['平均天数'] = weather_count['平均天数'].apply(lambda x: round(x, 1))
+weather_count = cube.weather_counts()
+weather_count['平均天数'] = (weather_count['天数'] / cube.n_years).round(1)
 
 for i, months in enumerate([range(1,5), range(5,9), range(9,13)], 1):
     plt.figure(figsize=(12,7))
@@ -104,13 +79,13 @@ for i, months in enumerate([range(1,5), range(5,9), range(9,13)], 1):
         sns.barplot(data=subset, x='month', y='平均天数', hue='天气')
         plt.xlabel('月份')
         plt.ylabel('平均天数')
-        plt.title(f'大连市近三年天气状况分布（{min(months)}-{max(months)}月）')
+        plt.title(f'{city_name}{args.start_year}-{args.end_year}年天气状况分布（{min(months)}-{max(months)}月）')
         plt.legend(title='天气状况', bbox_to_anchor=(1.05, 1), loc='upper left')
         plt.tight_layout()
-        plt.savefig(f'results/weather_bar_{i}.png')
+        plt.savefig(os.path.join(out_dir, f'weather_bar_{i}.png'))
         plt.close()
     else:
         print(f'{min(months)}-{max(months)}月天气状况数据为空，未生成柱状图。')
 
-print('所有可视化结果已保存到 results 文件夹。')
-print('每年每月平均最高气温已保存为 year_month_max_temp.xlsx。')
+print(f'所有可视化结果已保存到 {out_dir} 文件夹。')
+print(f'每年每月平均最高气温已保存为 {year_month_temp_path}。')
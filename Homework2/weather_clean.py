@@ -0,0 +1,80 @@
+"""天气数据清洗
+
+全部使用 pandas 的字符串访问器和一次性 to_datetime 做整列运算，
+不再对每一行调用 Python 函数。clean_weather 输出带类型的清洗结果，
+供 visual.py 中的统计和绘图直接复用。
+"""
+import pandas as pd
+
+WIND_LEVEL_PATTERN = r'(\d+\s*[-~]\s*\d+级|\d+级)'
+
+
+def parse_dates(s):
+    """把 '2022年01月01日' 一类的日期字符串整列解析为datetime，无法解析的为NaT"""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    s = s.astype(str).str.replace(r'[年月]', '-', regex=True)
+    s = s.str.replace(r'[日.]', '', regex=True).str.strip('-')
+    return pd.to_datetime(s, format='%Y-%m-%d', errors='coerce')
+
+
+def parse_temps(s):
+    """把 '12℃' 一类的气温字符串整列转为float，无法解析的为NaN"""
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype('float64')
+    s = s.astype(str).str.replace('℃', '', regex=False).str.replace(' ', '', regex=False)
+    return pd.to_numeric(s, errors='coerce').astype('float64')
+
+
+def extract_wind_levels(s):
+    """从 '东北风 3-4级' 一类的字符串中整列提取风力等级，如 '3-4级'"""
+    levels = s.astype(str).str.extract(WIND_LEVEL_PATTERN, expand=False)
+    return levels.str.replace(' ', '', regex=False)
+
+
+def wind_level_value(s):
+    """把 '3-4级'、'5级' 一类的风力等级整列转为数值（区间取中点），便于求均值和预测"""
+    bounds = s.astype(str).str.extract(r'(\d+)(?:[-~](\d+))?级').astype(float)
+    return bounds.mean(axis=1)
+
+
+def _shared_category(frame, columns):
+    """让多列共用同一个按字典序排列的分类类型，便于合并统计"""
+    values = pd.unique(frame[columns].stack().dropna())
+    dtype = pd.CategoricalDtype(sorted(values))
+    for col in columns:
+        frame[col] = frame[col].astype(dtype)
+
+
+def clean_weather(df):
+    """清洗原始天气数据，返回新的DataFrame
+
+    - 日期解析为datetime，丢弃无法解析的行，并增加 year、month 列
+    - 最高温度、最低温度转为float
+    - 白天/夜晚天气去除空白后转为共享类别的categorical，空字符串视为缺失
+    - 白天/夜晚风力只保留风力等级，同样转为共享类别的categorical
+    - 多城市数据保留 city 列（categorical）
+    """
+    if '日期' not in df.columns:
+        raise ValueError('数据表缺少"日期"列')
+    out = pd.DataFrame({'日期': parse_dates(df['日期'])})
+    keep = out['日期'].notnull().to_numpy()
+    out = out[keep].reset_index(drop=True)
+    src = df[keep].reset_index(drop=True)
+
+    if 'city' in src.columns:
+        out['city'] = src['city'].astype(str).astype('category')
+    out['year'] = out['日期'].dt.year.astype('int16')
+    out['month'] = out['日期'].dt.month.astype('int8')
+    for col in ['最高温度', '最低温度']:
+        out[col] = parse_temps(src[col])
+
+    for col in ['白天天气', '夜晚天气']:
+        weather = src[col].where(src[col].isnull(), src[col].astype(str).str.strip())
+        out[col] = weather.mask(weather == '')
+    _shared_category(out, ['白天天气', '夜晚天气'])
+
+    for col in ['白天风力', '夜晚风力']:
+        out[col] = extract_wind_levels(src[col])
+    _shared_category(out, ['白天风力', '夜晚风力'])
+    return out
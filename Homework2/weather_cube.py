@@ -0,0 +1,58 @@
+"""天气数据聚合立方体
+
+对清洗后的数据只做一次 groupby，得到 年 × 月 × 风力等级 × 天气 的计数立方体，
+同时累加每个格子内的最高/最低气温之和与个数。visual.py 中的所有图表和导出
+都从立方体上切片求和得到，图表数量再多也不需要重新扫描原始数据。
+"""
+import numpy as np
+import pandas as pd
+
+
+class WeatherCube:
+    def __init__(self, df):
+        # 白天、夜晚各算一条观测，拼成长表后一次分组
+        long = pd.DataFrame({
+            'year': np.tile(df['year'].to_numpy(), 2),
+            'month': np.tile(df['month'].to_numpy(), 2),
+            '风力': pd.concat([df['白天风力'], df['夜晚风力']], ignore_index=True),
+            '天气': pd.concat([df['白天天气'], df['夜晚天气']], ignore_index=True),
+            '最高温度': np.tile(df['最高温度'].to_numpy(), 2),
+            '最低温度': np.tile(df['最低温度'].to_numpy(), 2),
+        })
+        self.cube = long.groupby(['year', 'month', '风力', '天气'], observed=True, dropna=False).agg(
+            天数=('month', 'size'),
+            最高温度和=('最高温度', 'sum'),
+            最高温度数=('最高温度', 'count'),
+            最低温度和=('最低温度', 'sum'),
+            最低温度数=('最低温度', 'count'),
+        )
+        self.n_years = self.cube.index.get_level_values('year').nunique()
+
+    def _temp_mean(self, levels):
+        sums = self.cube.groupby(level=levels).sum()
+        return pd.DataFrame({
+            '最高温度': sums['最高温度和'] / sums['最高温度数'],
+            '最低温度': sums['最低温度和'] / sums['最低温度数'],
+        }).reset_index()
+
+    def monthly_temp(self):
+        """各月平均最高/最低温度（所有年份合并）"""
+        return self._temp_mean(['month'])
+
+    def year_month_temp(self):
+        """每年每月平均最高/最低温度"""
+        return self._temp_mean(['year', 'month'])
+
+    def wind_counts(self, month):
+        """某月各风力等级出现次数（白天、夜晚合计），按等级排序，不含缺失"""
+        days = self.cube['天数']
+        days = days[days.index.get_level_values('month') == month]
+        counts = days.groupby(level='风力', observed=True).sum().sort_index()
+        return counts[counts > 0]
+
+    def weather_counts(self):
+        """每月各天气状况出现天数（白天、夜晚合计），返回 month、天气、天数 三列"""
+        counts = self.cube['天数'].groupby(level=['month', '天气'], observed=True).sum()
+        counts = counts[counts > 0].reset_index()
+        counts['天气'] = counts['天气'].astype(str)
+        return counts
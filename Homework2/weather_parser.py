@@ -0,0 +1,139 @@
+"""tianqihoubao 月份页面 weather-table 表格解析
+
+提供三种可替换的解析后端，按速度从快到慢依次为 selectolax、lxml、BeautifulSoup。
+每个后端只负责把表格的四列（日期、天气、气温、风力）原样取成四个列表，
+之后统一由 columns_to_records 拆分白天/夜晚字段，保证各后端输出完全一致。
+"""
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    # selectolax 1.0 之前只有 Modest 后端
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+
+def _empty_columns():
+    return [], [], [], []
+
+
+def parse_columns_bs4(html):
+    """BeautifulSoup 后端（纯Python，最慢，作为兜底）"""
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', {'class': 'weather-table'})
+    if not table:
+        return None
+    columns = _empty_columns()
+    for tr in table.find_all('tr')[1:]:
+        tds = tr.find_all('td')
+        if len(tds) < 4:
+            continue
+        for col, td in zip(columns, tds[:4]):
+            col.append(td.get_text(strip=True))
+    return columns
+
+
+def parse_columns_lxml(html):
+    """lxml 后端"""
+    root = lxml_html.fromstring(html)
+    tables = root.xpath('//table[contains(concat(" ", normalize-space(@class), " "), " weather-table ")]')
+    if not tables:
+        return None
+    columns = _empty_columns()
+    for tr in tables[0].xpath('.//tr')[1:]:
+        tds = tr.xpath('./td')
+        if len(tds) < 4:
+            continue
+        for col, td in zip(columns, tds[:4]):
+            # 与 get_text(strip=True) 一致：逐个文本节点去空白后直接拼接
+            col.append(''.join(s.strip() for s in td.itertext()))
+    return columns
+
+
+def parse_columns_selectolax(html):
+    """selectolax 后端（基于C实现的Lexbor/Modest解析器，最快）"""
+    table = HTMLParser(html).css_first('table.weather-table')
+    if table is None:
+        return None
+    columns = _empty_columns()
+    for tr in table.css('tr')[1:]:
+        tds = tr.css('td')
+        if len(tds) < 4:
+            continue
+        for col, td in zip(columns, tds[:4]):
+            col.append(td.text(deep=True, separator='', strip=True))
+    return columns
+
+
+BACKENDS = {
+    'selectolax': parse_columns_selectolax,
+    'lxml': parse_columns_lxml,
+    'bs4': parse_columns_bs4,
+}
+
+
+def available_backends():
+    """返回当前环境可用的后端名称，按优先级排序"""
+    names = []
+    if HTMLParser is not None:
+        names.append('selectolax')
+    if lxml_html is not None:
+        names.append('lxml')
+    names.append('bs4')
+    return names
+
+
+def get_backend(name='auto'):
+    """按名称取解析后端，'auto' 表示选用可用的最快后端"""
+    if name == 'auto':
+        name = available_backends()[0]
+    if name not in available_backends():
+        raise ValueError(f'解析后端不可用: {name}，可用后端: {available_backends()}')
+    return BACKENDS[name]
+
+
+def _split_pair(text):
+    parts = [x.strip() for x in text.split('/')]
+    if len(parts) != 2:
+        return None
+    return parts
+
+
+def columns_to_records(columns):
+    """把四列原始文本拆分为每日记录"""
+    records = []
+    for date, weather, temp, wind in zip(*columns):
+        if not date or not weather or not temp or not wind:
+            continue
+        pair = _split_pair(weather)
+        day_weather, night_weather = pair if pair else (weather, '')
+        pair = _split_pair(temp)
+        high_temp, low_temp = [x.replace('℃', '').strip() for x in pair] if pair else ('', '')
+        pair = _split_pair(wind)
+        day_wind, night_wind = pair if pair else (wind, '')
+        records.append({
+            '日期': date,
+            '白天天气': day_weather,
+            '夜晚天气': night_weather,
+            '最高温度': high_temp,
+            '最低温度': low_temp,
+            '白天风力': day_wind,
+            '夜晚风力': night_wind,
+        })
+    return records
+
+
+def parse_month_page(html, backend='auto'):
+    """解析某月页面，返回每日记录列表；页面中没有 weather-table 时返回 None"""
+    columns = get_backend(backend)(html)
+    if columns is None:
+        return None
+    return columns_to_records(columns)
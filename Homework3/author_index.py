@@ -0,0 +1,111 @@
+"""作者索引与合作关系图
+
+把每篇论文的 'A, B, C' 作者字符串只拆分一次：作者名去重后编号（names[i] 为编号 i 的作者），
+论文 → 作者用 CSR 形式的 indptr / indices 两个整数数组保存，第 p 篇论文的作者编号为
+indices[indptr[p]:indptr[p + 1]]。每篇论文另存会议编号和年份，用于按会议、年份筛选。
+合作关系图是稀疏的 作者 × 作者 矩阵，值为两人合作的论文数。
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class AuthorIndex:
+    def __init__(self, names, indptr, indices, conferences, conference_codes, years):
+        self.names = names                      # 作者编号 -> 作者名
+        self.indptr = indptr                    # 论文 p 的作者在 indices 中的起止位置
+        self.indices = indices                  # 作者编号
+        self.conferences = conferences          # 会议编号 -> 会议名
+        self.conference_codes = conference_codes
+        self.years = years
+        self._name_ids = None
+
+    @classmethod
+    def from_frame(cls, df):
+        """由论文表（含 authors、conference、year 列）构建索引"""
+        authors = df['authors'].reset_index(drop=True).fillna('').str.split(', ').explode()
+        authors = authors[authors.str.len() > 0]
+        ids, names = pd.factorize(authors, sort=False)
+        paper_counts = np.bincount(authors.index.to_numpy(), minlength=len(df))
+        indptr = np.zeros(len(df) + 1, dtype=np.int64)
+        np.cumsum(paper_counts, out=indptr[1:])
+        conference_codes, conferences = pd.factorize(df['conference'])
+        return cls(np.asarray(names, dtype=object), indptr, ids.astype(np.int32),
+                   np.asarray(conferences, dtype=object), conference_codes.astype(np.int16),
+                   df['year'].to_numpy(dtype=np.int16))
+
+    @property
+    def n_papers(self):
+        return len(self.indptr) - 1
+
+    @property
+    def n_authors(self):
+        return len(self.names)
+
+    def author_id(self, name):
+        if self._name_ids is None:
+            self._name_ids = {n: i for i, n in enumerate(self.names)}
+        return self._name_ids[name]
+
+    def paper_authors(self, p):
+        """第 p 篇论文的作者名列表"""
+        return list(self.names[self.indices[self.indptr[p]:self.indptr[p + 1]]])
+
+    def paper_mask(self, conferences=None, years=None):
+        """按会议、年份筛选论文的布尔数组，None 表示不过滤"""
+        mask = np.ones(self.n_papers, dtype=bool)
+        if conferences is not None:
+            codes = [i for i, c in enumerate(self.conferences) if c in conferences]
+            mask &= np.isin(self.conference_codes, codes)
+        if years is not None:
+            mask &= np.isin(self.years, list(years))
+        return mask
+
+    def incidence(self, conferences=None, years=None):
+        """论文 × 作者 的 0/1 稀疏矩阵（CSR），只保留筛选出的论文对应的行"""
+        data = np.ones(len(self.indices), dtype=np.int32)
+        matrix = sparse.csr_matrix((data, self.indices, self.indptr),
+                                   shape=(self.n_papers, self.n_authors))
+        if conferences is None and years is None:
+            return matrix
+        return matrix[self.paper_mask(conferences, years)]
+
+    def coauthorship(self, conferences=None, years=None):
+        """作者 × 作者 合作矩阵，值为合作论文数，对角线为 0"""
+        A = self.incidence(conferences, years)
+        C = (A.T @ A).tocsr()
+        C.setdiag(0)
+        C.eliminate_zeros()
+        return C
+
+    def top_authors(self, k=10, conferences=None, years=None):
+        """发文最多的 k 位作者"""
+        mask = self.paper_mask(conferences, years)
+        per_slot = np.repeat(mask, np.diff(self.indptr))
+        counts = np.bincount(self.indices[per_slot], minlength=self.n_authors)
+        return self._top(counts, k)
+
+    def top_collaborators(self, name, k=10, conferences=None, years=None):
+        """与某作者合作论文数最多的 k 位作者"""
+        row = self.coauthorship(conferences, years).getrow(self.author_id(name)).toarray().ravel()
+        return self._top(row, k)
+
+    def top_pairs(self, k=10, conferences=None, years=None):
+        """合作论文数最多的 k 对作者"""
+        C = sparse.triu(self.coauthorship(conferences, years), k=1).tocoo()
+        if C.nnz == 0:
+            return pd.DataFrame(columns=['author_a', 'author_b', 'papers'])
+        top = np.argsort(-C.data, kind='stable')[:k]
+        return pd.DataFrame({'author_a': self.names[C.row[top]], 'author_b': self.names[C.col[top]],
+                             'papers': C.data[top]})
+
+    def _top(self, counts, k):
+        k = min(k, int(np.count_nonzero(counts)))
+        top = np.argpartition(-counts, k - 1)[:k] if k > 0 else np.array([], dtype=np.int64)
+        top = top[np.argsort(-counts[top], kind='stable')]
+        return pd.Series(counts[top], index=pd.Index(self.names[top], name='author'), name='papers')
+
+    def nbytes(self):
+        """索引数组加上去重后作者名的大致内存占用（字节）"""
+        arrays = self.indptr.nbytes + self.indices.nbytes + self.conference_codes.nbytes + self.years.nbytes
+        return arrays + sum(len(n.encode()) + 49 for n in self.names)
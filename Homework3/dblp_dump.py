@@ -0,0 +1,177 @@
+"""离线读取 DBLP 全量数据 dblp.xml(.gz)
+
+用 lxml.etree.iterparse 增量解析，每处理完一条记录就把它从树上删除，
+内存占用与 dump 大小无关。只保留 conferences 中列出的会议在指定年份正会论文集中的
+article / inproceedings：按记录的 crossref 匹配 conf/<code>/<年份>（分卷时为 conf/<code>/<年份>-<n>），
+与在线抓取的 <code><年份>.xml 目录页一致。同样以 conf/<code>/ 开头的 workshop、companion 等
+论文集的 crossref 不同（如 conf/aaai/2020w），不计入。
+
+未压缩的 dblp.xml 可以按字节范围切成若干段交给多个进程并行解析：
+每段的边界对齐到某条记录的起始标签，段前补上 XML 声明、DOCTYPE 和
+<dblp> 根节点，使每段都是一个独立的合法文档。gzip 文件无法随机访问，只能单进程流式读取。
+
+dblp.xml 中的 &uuml; 等实体定义在 dblp.dtd 里，dblp.dtd 需与 dump 放在同一目录。
+"""
+import gzip
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from lxml import etree
+
+# DBLP 的全部顶层记录类型，不论是否需要都要及时清理
+RECORD_TAGS = ('article', 'inproceedings', 'proceedings', 'book', 'incollection',
+               'phdthesis', 'mastersthesis', 'www', 'person', 'data')
+PAPER_TAGS = ('article', 'inproceedings')
+RECORD_START = re.compile(rb'<(?:' + b'|'.join(t.encode() for t in RECORD_TAGS) + rb')[\s>]')
+
+# 正会论文集的 key：conf/<code>/<年份>，分卷时带 -<n> 后缀
+MAIN_PROCEEDINGS = re.compile(r'conf/([^/]+)/(\d{4})(?:-\d+)?')
+
+BLOCK_SIZE = 1 << 20
+
+
+class _RangeStream:
+    """只读文件对象：先输出 header，再输出 [start, end) 字节范围，最后输出 footer
+
+    name 属性指向 dump 文件，lxml 据此解析 DTD 的相对路径
+    """
+    def __init__(self, path, start, end, header=b'', footer=b''):
+        self.name = path
+        self._f = open(path, 'rb')
+        self._f.seek(start)
+        self._remaining = end - start
+        self._pending = [header] if header else []
+        self._footer = footer
+
+    def read(self, size=BLOCK_SIZE):
+        if self._pending:
+            return self._pending.pop()
+        if self._remaining > 0:
+            data = self._f.read(min(size, self._remaining))
+            self._remaining -= len(data)
+            if data:
+                return data
+            self._remaining = 0
+        data, self._footer = self._footer, b''
+        return data
+
+    def close(self):
+        self._f.close()
+
+
+def _read_header(path):
+    """返回 (dump 开头到 <dblp ...> 根标签为止的内容, 正文起始偏移)"""
+    with open(path, 'rb') as f:
+        head = f.read(4096)
+    match = re.search(rb'<dblp[^>]*>', head)
+    if not match:
+        raise ValueError(f'{path} 开头没有找到 <dblp> 根节点')
+    return head[:match.end()], match.end()
+
+
+def split_ranges(path, n):
+    """把 dump 按字节大致均分为 n 段，每段起点对齐到下一条记录的起始标签"""
+    size = os.path.getsize(path)
+    bounds = [_read_header(path)[1]]
+    with open(path, 'rb') as f:
+        for i in range(1, n):
+            f.seek(size * i // n)
+            offset = f.tell()
+            buf = b''
+            while True:
+                block = f.read(BLOCK_SIZE)
+                if not block:
+                    offset = size
+                    break
+                buf = buf[-32:] + block
+                match = RECORD_START.search(buf)
+                if match:
+                    offset = f.tell() - len(buf) + match.start()
+                    break
+            if offset > bounds[-1]:
+                bounds.append(offset)
+    # 最后一段截止到 </dblp> 之前
+    with open(path, 'rb') as f:
+        f.seek(max(size - 4096, 0))
+        tail = f.read()
+    closing = tail.rfind(b'</dblp>')
+    bounds.append(size - len(tail) + closing if closing >= 0 else size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _record_to_paper(elem, venues, years):
+    if not elem.get('key', '').startswith('conf/'):
+        return None
+    match = MAIN_PROCEEDINGS.fullmatch((elem.findtext('crossref') or '').strip())
+    if match is None or match.group(1) not in venues:
+        return None
+    # 年份取所属论文集的年份，与按 <code><年份>.xml 抓取的分区一致
+    year = int(match.group(2))
+    if years is not None and year not in years:
+        return None
+    title_elem = elem.find('title')
+    if title_elem is None:
+        return None
+    ee = elem.find('ee')
+    return {
+        'title': ''.join(title_elem.itertext()).strip(),
+        'authors': ', '.join(''.join(a.itertext()).strip() for a in elem.iterfind('author')),
+        'year': year,
+        'conference': venues[match.group(1)],
+        'url': ee.text if ee is not None and ee.text else '',
+    }
+
+
+def iter_papers(source, conferences, years=None):
+    """从文件路径或文件对象中增量解析论文，逐条产出与 fetch_dblp_data 相同字段的字典
+
+    conferences 为 {会议名: dblp代码}，years 为可选的年份集合
+    """
+    venues = {code: name for name, code in conferences.items()}
+    years = set(years) if years is not None else None
+    context = etree.iterparse(source, events=('end',), tag=RECORD_TAGS,
+                              load_dtd=True, resolve_entities=True, huge_tree=True)
+    for _, elem in context:
+        if elem.tag in PAPER_TAGS:
+            paper = _record_to_paper(elem, venues, years)
+            if paper is not None:
+                yield paper
+        # 释放已处理的记录及其之前的兄弟节点
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def _parse_range(path, start, end, header, conferences, years):
+    stream = _RangeStream(path, start, end, header=header, footer=b'\n</dblp>\n')
+    try:
+        return list(iter_papers(stream, conferences, years))
+    finally:
+        stream.close()
+
+
+def load_dump(path, conferences, years=None, processes=1):
+    """读取本地 DBLP dump，返回与 fetch_dblp_data 相同结构的 DataFrame
+
+    path 以 .gz 结尾时单进程流式解压解析；否则按字节范围分给 processes 个进程并行解析
+    """
+    if path.endswith('.gz') or processes <= 1:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            return pd.DataFrame(iter_papers(f, conferences, years),
+                                columns=['title', 'authors', 'year', 'conference', 'url'])
+
+    header = _read_header(path)[0]
+    ranges = split_ranges(path, processes)
+    print(f"按字节范围切分为 {len(ranges)} 段，使用 {processes} 个进程解析")
+    papers = []
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(_parse_range, path, start, end, header, conferences, years)
+                   for start, end in ranges]
+        for future in futures:
+            papers.extend(future.result())
+    return pd.DataFrame(papers, columns=['title', 'authors', 'year', 'conference', 'url'])
@@ -1,80 +1,152 @@
 # 1. 安装必要库
-# !pip install pandas numpy matplotlib seaborn wordcloud sklearn statsmodels lxml
+# !pip install pandas numpy scipy matplotlib seaborn wordcloud sklearn statsmodels lxml
 
-# 2. 导入所有库
-import requests
-from bs4 import BeautifulSoup
+# 2. 导入库：这里只导入所有子命令都要用的轻量库，
+# requests/bs4/matplotlib/seaborn/wordcloud/sklearn/statsmodels/scipy 在用到它们的阶段内才导入
+import time
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-from sklearn.feature_extraction.text import CountVectorizer
-from statsmodels.tsa.arima.model import ARIMA
-import re
 import os
+import argparse
+import threading
 import warnings
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from paper_cache import PaperCache
 warnings.filterwarnings('ignore')
-plt.rcParams['font.family'] = 'SimHei'  # 中文显示
 
-def fetch_dblp_data(conferences, years):
-    """从DBLP爬取指定会议和年份的论文数据"""
+def _pyplot():
+    """按需导入 matplotlib 并设置中文字体"""
+    import matplotlib.pyplot as plt
+    plt.rcParams['font.family'] = 'SimHei'  # 中文显示
+    return plt
+
+class HostLimiter:
+    """按host限制同时进行的请求数"""
+    def __init__(self, max_per_host):
+        self.max_per_host = max_per_host
+        self.lock = threading.Lock()
+        self.semaphores = {}
+
+    def __call__(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.semaphores[host]
+
+
+def parse_dblp_xml(content, conf_name, year):
+    """解析某会议某年的DBLP XML，返回论文字典列表"""
+    from bs4 import BeautifulSoup
+    papers = []
+    soup = BeautifulSoup(content, 'xml')
+    for article in soup.find_all(['article', 'inproceedings']):
+        title = article.find('title').text.strip()
+        authors = [a.text.strip() for a in article.find_all('author')]
+        paper_url = article.find('ee').text if article.find('ee') else ""
+        papers.append({
+            'title': title,
+            'authors': ', '.join(authors),
+            'year': year,
+            'conference': conf_name,
+            'url': paper_url
+        })
+    return papers
+
+
+def fetch_partition(session, limiter, conf_name, conf_code, year):
+    """下载并立即解析一个 (会议, 年份) 分区，返回 (论文列表, 耗时统计)"""
+    url = f"https://dblp.org/db/conf/{conf_code}/{conf_code}{year}.xml"
+    start = time.perf_counter()
+    with limiter(url):
+        response = session.get(url, timeout=20)
+    downloaded = time.perf_counter()
+    response.raise_for_status()
+    papers = parse_dblp_xml(response.content, conf_name, year)
+    stats = {
+        'download_s': downloaded - start,
+        'parse_s': time.perf_counter() - downloaded,
+        'bytes': len(response.content),
+    }
+    return papers, stats
+
+
+def fetch_dblp_data(conferences, years, max_workers=12, max_per_host=6, partitions=None, on_partition=None):
+    """从DBLP并发爬取指定会议和年份的论文数据
+
+    所有 (会议, 年份) 分区共用一个keep-alive Session，同一host同时最多 max_per_host 个请求；
+    每个分区下载完成后立即在工作线程中解析，其余分区同时继续下载。结束时打印各分区耗时。
+    partitions 为 (会议名, 年份) 列表时只抓取这些分区；on_partition(会议名, 年份, 论文列表, 错误)
+    在每个分区结束后调用，成功时错误为 None。
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    if partitions is None:
+        partitions = [(conf_name, year) for conf_name in conferences for year in years]
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+    session.mount('https://', adapter)
+    limiter = HostLimiter(max_per_host)
+
     all_papers = []
-    for conf_name, conf_code in conferences.items():
-        for year in years:
-            url = f"https://dblp.org/db/conf/{conf_code}/{conf_code}{year}.xml"
-            print(f"正在爬取: {conf_name} {year} ({url})")
-            
+    report = []
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for conf_name, year in partitions:
+            future = executor.submit(fetch_partition, session, limiter, conf_name, conferences[conf_name], year)
+            futures[future] = (conf_name, year)
+        for future in as_completed(futures):
+            conf_name, year = futures[future]
             try:
-                response = requests.get(url, timeout=20)
-                soup = BeautifulSoup(response.content, 'xml')
-                
-                # 提取论文信息
-                for article in soup.find_all(['article', 'inproceedings']):
-                    title = article.find('title').text.strip()
-                    authors = [a.text.strip() for a in article.find_all('author')]
-                    paper_url = article.find('ee').text if article.find('ee') else ""
-                    
-                    all_papers.append({
-                        'title': title,
-                        'authors': ', '.join(authors),
-                        'year': year,
-                        'conference': conf_name,
-                        'url': paper_url
-                    })
+                papers, stats = future.result()
             except Exception as e:
                 print(f"爬取出错: {conf_name}{year} - {str(e)}")
-                if 'response' in locals():
-                    print(f"响应状态码: {response.status_code}")
-                    
-    return pd.DataFrame(all_papers)
-
-def preprocess_titles(df):
-    """预处理论文标题"""
-    def preprocess_title(title):
-        # 移除非字母字符、转小写
-        title = re.sub(r'[^a-zA-Z\s]', '', title).lower()
-        # 移除常见停用词
-        stop_words = {'for', 'and', 'with', 'using', 'based', 'via', 'towards', 
-                      'toward', 'learning', 'approach', 'method', 'via', 'network',
-                      'deep', 'model', 'models', 'neural', 'via', 'new', 'based'}
-        words = [word for word in title.split() if len(word) > 2 and word not in stop_words]
-        return ' '.join(words)
-    
-    df['clean_title'] = df['title'].apply(preprocess_title)
+                report.append({'conference': conf_name, 'year': year, 'status': 'failed', 'papers': 0,
+                               'error': str(e)})
+                if on_partition is not None:
+                    on_partition(conf_name, year, [], e)
+                continue
+            print(f"完成: {conf_name} {year}，{len(papers)} 篇，{stats['download_s'] + stats['parse_s']:.2f}s")
+            all_papers.extend(papers)
+            if on_partition is not None:
+                on_partition(conf_name, year, papers)
+            report.append({'conference': conf_name, 'year': year, 'status': 'ok', 'papers': len(papers), **stats})
+    wall = time.perf_counter() - wall_start
+    session.close()
+
+    report = pd.DataFrame(report)
+    if 'download_s' in report.columns:
+        report['total_s'] = report['download_s'] + report['parse_s']
+        report = report.sort_values('total_s', ascending=False)
+        print("\n各分区耗时（秒）:")
+        print(report.round(3).to_string(index=False))
+        print(f"总耗时 {wall:.2f}s，最慢分区 {report['total_s'].max():.2f}s，各分区耗时之和 {report['total_s'].sum():.2f}s")
+    return pd.DataFrame(all_papers, columns=['title', 'authors', 'year', 'conference', 'url'])
+
+def preprocess_titles(df, processes=1):
+    """预处理论文标题，得到每篇论文的关键词列表 tokens"""
+    from title_tokens import tokenize_titles
+    df['tokens'] = tokenize_titles(df['title'], processes=processes).values
     return df
 
-def plot_paper_trends(df):
-    """绘制论文数量趋势图"""
-    # 统计各会议年度论文数量
-    conf_year_counts = df.groupby(['conference', 'year']).size().unstack().fillna(0)
+def paper_counts(df):
+    """聚合各会议年度论文数量：行为会议，列为年份（包含中间没有论文的年份）"""
+    all_years = range(df['year'].min(), df['year'].max() + 1)
+    return (df.groupby(['conference', 'year']).size()
+            .unstack(fill_value=0)
+            .reindex(columns=all_years, fill_value=0))
+
+def plot_paper_trends(conf_year_counts):
+    """绘制论文数量趋势图，conf_year_counts 为 paper_counts 聚合后的 会议 × 年份 表"""
+    plt = _pyplot()
     print("\n各会议年度论文数量:")
     print(conf_year_counts)
     
     # 绘制趋势图
     plt.figure(figsize=(12, 6))
-    sns.lineplot(data=df, x='year', y=df.index, hue='conference', 
-                 estimator='count', errorbar=None, marker='o', linewidth=2.5)
+    for conf, counts in conf_year_counts.iterrows():
+        plt.plot(counts.index, counts.values, marker='o', linewidth=2.5, label=conf)
     plt.title('顶级会议论文数量趋势 (2020-2025)', fontsize=15)
     plt.ylabel('论文数量', fontsize=12)
     plt.xlabel('年份', fontsize=12)
@@ -84,12 +156,22 @@ def plot_paper_trends(df):
     plt.savefig('charts/conference_trend.png', dpi=300)  # 修改路径
     plt.show()
     
-def generate_combined_wordcloud(df):
-    """生成五年合并的关键词词云"""
-    # 合并所有年份的论文标题
-    all_text = ' '.join(df['clean_title'])
+def generate_combined_wordcloud(index, conferences=None, years=None, duplicates=None):
+    """生成五年合并的关键词词云，词频直接从关键词索引中按会议、年份切片求和
+
+    duplicates 为近似重复的论文（带 load_papers 中算好的 tokens 列），其标题的词频从索引结果中扣除
+    """
+    import seaborn as sns
+    from wordcloud import WordCloud
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    from title_tokens import token_counts
+    plt = _pyplot()
+    subtract = None
+    if duplicates is not None and len(duplicates):
+        subtract = token_counts(duplicates['tokens'])
+    counts = index.top_k(150, conferences, years, exclude=ENGLISH_STOP_WORDS, subtract=subtract)
     
-    if not all_text.strip():
+    if counts.empty:
         print("没有可用的文本数据生成词云")
         return
     
@@ -103,7 +185,7 @@ def generate_combined_wordcloud(df):
         collocations=False,  # 避免重复词语
         stopwords=None,      # 使用自定义停用词
         colormap='viridis'   # 使用更鲜艳的配色
-    ).generate(all_text)
+    ).generate_from_frequencies(counts.to_dict())
     
     # 绘制词云
     plt.imshow(wc, interpolation='bilinear')
@@ -114,12 +196,7 @@ def generate_combined_wordcloud(df):
     plt.show()
     
     # 提取高频关键词
-    vectorizer = CountVectorizer(max_features=50, stop_words='english')
-    X = vectorizer.fit_transform([all_text])
-    word_freq = pd.Series(
-        np.array(X.sum(axis=0))[0],
-        index=vectorizer.get_feature_names_out()
-    ).sort_values(ascending=False)
+    word_freq = counts.head(50)
     
     print("\n2020-2025年高频关键词TOP 20:")
     print(word_freq.head(20))
@@ -140,33 +217,26 @@ def generate_combined_wordcloud(df):
     plt.savefig('charts/top_keywords_bar.png', dpi=300)  # 修改路径
     plt.show()
 
-def predict_paper_counts(df):
-    """预测下一届会议论文数量"""
+def predict_paper_counts(counts, processes=1, cache_path=None):
+    """预测下一届会议论文数量：各会议并行按 AIC 选择 ARIMA 阶数，拟合结果按序列缓存
+
+    counts 为 paper_counts 聚合后的 会议 × 年份 表
+    """
+    import seaborn as sns
+    from venue_forecast import forecast_venues
+    plt = _pyplot()
     plt.figure(figsize=(12, 8))
     
-    conferences = df['conference'].unique()
-    next_year = df['year'].max() + 1
+    next_year = counts.columns.max() + 1
+    results = forecast_venues(counts, steps=1, processes=processes, cache_path=cache_path)
+    conferences = counts.index
     
     for i, conf in enumerate(conferences):
-        # 获取历史数据
-        conf_data = df[df['conference'] == conf]
-        yearly_counts = conf_data['year'].value_counts().sort_index()
-        
-        # 转换为时间序列（确保包含所有年份）
-        all_years = range(df['year'].min(), next_year)
-        ts_data = yearly_counts.reindex(all_years, fill_value=0)
-        
-        # 训练ARIMA模型
-        try:
-            model = ARIMA(ts_data, order=(1, 1, 1))
-            model_fit = model.fit()
-            
-            # 预测下一年
-            forecast = model_fit.forecast(steps=1)
-            predicted_next = int(round(forecast.iloc[0]))
-        except Exception as e:
-            print(f"预测失败 {conf}: {str(e)}")
-            predicted_next = ts_data.iloc[-1]  # 使用最近一年的数据作为预测
+        ts_data = counts.loc[conf]
+        result = results.loc[conf]
+        if result['order'] is None:
+            print(f"预测失败 {conf}: 所有候选阶数均无法拟合，使用最近一年的数据作为预测")
+        predicted_next = int(round(result['forecast'][0]))
         # 动态调整行数
         rows = (len(conferences) + 1) // 2 
         # 绘制历史趋势和预测
@@ -183,53 +253,160 @@ def predict_paper_counts(df):
         plt.legend()
         plt.grid(alpha=0.3)
         
-        print(f"{conf} {next_year}年预测论文数: {predicted_next} (最近一年实际: {ts_data.iloc[-1]})")
+        print(f"{conf} {next_year}年预测论文数: {predicted_next} (ARIMA{result['order']}，最近一年实际: {ts_data.iloc[-1]})")
     
     plt.tight_layout()
     plt.savefig('charts/prediction.png', dpi=300)  # 修改路径
     plt.show()
 
+def analyze_authors(df, k=10):
+    """作者分析：整体和各会议发文最多的作者、合作最多的作者对"""
+    from author_index import AuthorIndex
+    index = AuthorIndex.from_frame(df)
+    print(f"\n共 {index.n_papers} 篇论文、{index.n_authors} 位作者，作者索引约 {index.nbytes() / 1e6:.1f} MB")
+    print(f"\n发文最多的 {k} 位作者:")
+    print(index.top_authors(k))
+    
+    tables = []
+    for conf in index.conferences:
+        top = index.top_authors(k, conferences=[conf]).reset_index()
+        top.insert(0, 'conference', conf)
+        tables.append(top)
+    pd.concat(tables, ignore_index=True).to_csv('top_authors.csv', index=False)
+    
+    print(f"\n合作论文最多的 {k} 对作者:")
+    print(index.top_pairs(k).to_string(index=False))
+    return index
+
+# 定义会议列表和年份范围 (2020-2025)
+CONFERENCES = {
+    'AAAI': 'aaai',
+    'CVPR': 'cvpr',
+    'NeurIPS': 'nips',
+    'ICML': 'icml',
+    'IJCAI': 'ijcai',
+    'KDD': 'kdd'
+}
+YEARS = range(2020, 2026)  # 2020-2025
+
+COMMANDS = {
+    'crawl': '只补齐论文缓存（在线爬取或 --dump 离线导入）',
+    'status': '查看缓存中各分区的抓取状态',
+    'trends': '论文数量趋势图',
+    'keywords': '关键词词云与高频词',
+    'predict': '论文数量预测',
+    'authors': '作者与合作关系分析',
+    'all': '执行全部分析（默认）',
+}
+
+def update_cache(args):
+    """获取数据：按 (会议, 年份) 分区缓存，只补齐缺失或上次失败的分区"""
+    cache = PaperCache(args.cache_dir)
+    legacy_file = 'dblp_papers_2020-2025.csv'
+    if args.dump:
+        from dblp_dump import load_dump
+        print(f"从本地 DBLP dump 读取数据: {args.dump}")
+        df = load_dump(args.dump, CONFERENCES, YEARS, processes=args.processes)
+        cache.import_frame(df, CONFERENCES, YEARS, source='dump', complete=True)
+    elif not cache.manifest and os.path.exists(legacy_file):
+        print(f"把旧的单文件数据 {legacy_file} 拆分为分区缓存...")
+        cache.import_frame(pd.read_csv(legacy_file), CONFERENCES, YEARS, source=legacy_file)
+
+    todo = [(conf, year) for conf in CONFERENCES for year in YEARS] if args.refresh \
+        else cache.missing(CONFERENCES, YEARS)
+    if todo:
+        print(f"从DBLP爬取 {len(todo)} 个缺失或失败的分区...")
+        fetch_dblp_data(CONFERENCES, YEARS, partitions=todo, on_partition=cache.on_partition)
+    failed = cache.missing(CONFERENCES, YEARS)
+    if failed:
+        print(f"仍有 {len(failed)} 个分区抓取失败，下次运行时重试: {failed}")
+    return cache
+
+def load_papers(args, cache):
+    """只读取需要分析的会议、年份分区，并去掉近似重复的论文
+
+    返回 (去重后的论文, 被标记为重复的论文, 会议列表, 年份范围)
+    """
+    venues = args.venues or list(CONFERENCES)
+    years = range(args.years[0], args.years[1] + 1) if args.years else YEARS
+    df = cache.load(venues, years)
+    
+    print(f"总论文数: {len(df)}")
+    if len(df):
+        print("数据年份范围:", df['year'].min(), "至", df['year'].max())
+    
+    if args.no_dedup or df.empty:
+        return df, df.iloc[:0], venues, years
+    # 标题只分词一次，近似重复检测和词云中扣除重复论文词频都使用这里的 tokens 列
+    df = preprocess_titles(df, processes=args.processes)
+    # 近似重复论文（workshop/正会版本、勘误、改名）只保留每组最早的一条
+    from title_dedup import mark_near_duplicates
+    df = mark_near_duplicates(df, processes=args.processes)
+    duplicates = df[df['is_duplicate']]
+    df = df[~df['is_duplicate']].reset_index(drop=True)
+    print(f"标记近似重复论文 {len(duplicates)} 篇，去重后 {len(df)} 篇")
+    return df, duplicates, venues, years
+
 def main():
-    """主函数，执行整个分析流程"""
+    """主函数，按子命令执行对应的分析阶段"""
+    parser = argparse.ArgumentParser(
+        description='顶级会议论文分析',
+        epilog='子命令: ' + '；'.join(f'{name} {desc}' for name, desc in COMMANDS.items()))
+    parser.add_argument('command', nargs='?', default='all', choices=list(COMMANDS), help='要执行的分析阶段')
+    parser.add_argument('--dump', default=None, help='本地 DBLP 全量数据 dblp.xml 或 dblp.xml.gz，指定后离线读取')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                        help='离线读取未压缩 dblp.xml、标题分词、ARIMA 拟合时的并行进程数')
+    parser.add_argument('--cache-dir', default='dblp_cache', help='按会议、年份分区的论文缓存目录')
+    parser.add_argument('--refresh', action='store_true', help='忽略缓存，重新抓取全部分区')
+    parser.add_argument('--venues', nargs='*', default=None, help='只分析这些会议，默认全部')
+    parser.add_argument('--years', nargs=2, type=int, default=None, metavar=('START', 'END'),
+                        help='只分析这一年份区间，默认 2020 2025')
+    parser.add_argument('--no-dedup', action='store_true', help='不做近似重复论文检测')
+    args = parser.parse_args()
+    run(args)
+
+def run(args):
+    command = args.command
+    if command == 'status':
+        summary = PaperCache(args.cache_dir).summary()
+        print(summary.to_string(index=False) if len(summary) else "缓存为空")
+        return
+
+    cache = update_cache(args)
+    if command == 'crawl':
+        return
+
     # 创建 charts 文件夹（如果不存在）
     charts_dir = 'charts'
     if not os.path.exists(charts_dir):
         os.makedirs(charts_dir)
         print(f"创建文件夹: {charts_dir}")
     
-    # 定义会议列表和年份范围 (2020-2025)
-    conferences = {
-        'AAAI': 'aaai',
-        'CVPR': 'cvpr',
-        'NeurIPS': 'nips',
-        'ICML': 'icml',
-        'IJCAI': 'ijcai',
-        'KDD': 'kdd'
-    }
-    years = range(2020, 2026)  # 2020-2025
-    
-    # 获取数据
-    data_file = 'dblp_papers_2020-2025.csv'
-    if os.path.exists(data_file):
-        print("加载本地数据文件...")
-        df = pd.read_csv(data_file)
-    else:
-        print("从DBLP爬取数据...")
-        df = fetch_dblp_data(conferences, years)
-        df.to_csv(data_file, index=False)
-    
-    print(f"总论文数: {len(df)}")
-    print("数据年份范围:", df['year'].min(), "至", df['year'].max())
-    
-    # 预处理标题
-    df = preprocess_titles(df)
+    df, duplicates, venues, years = load_papers(args, cache)
+    if df.empty:
+        print("所选会议、年份没有可用的论文数据（分区可能全部抓取失败或被筛选掉），跳过分析")
+        return
     
-    # 分析任务
-    plot_paper_trends(df)         # 任务2：论文数量趋势
-    generate_combined_wordcloud(df) # 任务3：五年合并关键词分析
-    predict_paper_counts(df)       # 任务4：论文数量预测
+    # 分析任务：先聚合一次，趋势图和预测共用
+    if command in ('trends', 'predict', 'all'):
+        counts = paper_counts(df)
+    if command in ('trends', 'all'):
+        plot_paper_trends(counts)     # 任务2：论文数量趋势
+    if command in ('keywords', 'all'):
+        # 关键词索引：只对新增或重新抓取过的分区分词
+        from term_index import TermIndex
+        index = TermIndex(args.cache_dir)
+        updated = index.update(cache, processes=args.processes)
+        if updated:
+            print(f"关键词索引已更新 {updated} 个分区，共 {len(index.terms)} 个关键词")
+        generate_combined_wordcloud(index, venues, years, duplicates) # 任务3：五年合并关键词分析
+    if command in ('predict', 'all'):
+        predict_paper_counts(counts, processes=args.processes,
+                             cache_path=os.path.join(args.cache_dir, 'arima_cache.json'))  # 任务4：论文数量预测
+    if command in ('authors', 'all'):
+        analyze_authors(df)            # 作者与合作关系分析
     
     print("\n分析完成！结果已保存到 charts 文件夹中。")  # 更新提示信息
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
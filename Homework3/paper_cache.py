@@ -0,0 +1,132 @@
+"""按 (会议, 年份) 分区的论文缓存
+
+每个分区保存为 dblp_cache/<会议>/<年份>.csv，manifest.json 记录每个分区的
+抓取状态（ok / failed）、论文数、来源、时间和错误信息。
+只有缺失或失败的分区需要重新抓取；分析时只读取所需会议、年份的分区文件。
+"""
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+CACHE_DIR = 'dblp_cache'
+COLUMNS = ['title', 'authors', 'year', 'conference', 'url']
+
+
+class PaperCache:
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {}
+
+    @staticmethod
+    def key(conference, year):
+        return f'{conference}/{year}'
+
+    def partition_path(self, conference, year):
+        return os.path.join(self.directory, conference, f'{year}.csv')
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def status(self, conference, year):
+        entry = self.manifest.get(self.key(conference, year))
+        if entry is None:
+            return 'missing'
+        if entry['status'] == 'ok' and not os.path.exists(self.partition_path(conference, year)):
+            return 'missing'
+        return entry['status']
+
+    def missing(self, conferences, years):
+        """返回需要抓取的 (会议, 年份)：从未抓取、文件丢失或上次失败的分区"""
+        return [(conf, year) for conf in conferences for year in years
+                if self.status(conf, year) != 'ok']
+
+    def write_partition(self, conference, year, papers, source='web'):
+        """写入一个分区（先写临时文件再原子替换），并在 manifest 中标记为 ok"""
+        path = self.partition_path(conference, year)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pd.DataFrame(papers, columns=COLUMNS).to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+        self.manifest[self.key(conference, year)] = {
+            'status': 'ok',
+            'papers': len(papers),
+            'source': source,
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self._save_manifest()
+
+    def mark_failed(self, conference, year, error, source='web'):
+        """记录失败的分区，下次运行时会重新抓取
+
+        该分区已有抓取成功的数据时（如 --refresh 失败），保留原来的 ok 记录和数据文件，
+        只在 last_error、last_failed_at 中记下这次的错误
+        """
+        key = self.key(conference, year)
+        entry = self.manifest.get(key)
+        if entry is not None and self.status(conference, year) == 'ok':
+            entry['last_error'] = str(error)
+            entry['last_failed_at'] = datetime.now().isoformat(timespec='seconds')
+            self._save_manifest()
+            return
+        self.manifest[key] = {
+            'status': 'failed',
+            'papers': 0,
+            'source': source,
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            'error': str(error),
+        }
+        self._save_manifest()
+
+    def on_partition(self, conference, year, papers, error=None):
+        """供 fetch_dblp_data 回调：每个分区抓取结束后立即落盘"""
+        if error is None:
+            self.write_partition(conference, year, papers)
+        else:
+            self.mark_failed(conference, year, error)
+
+    def import_frame(self, df, conferences, years, source, complete=False):
+        """把一个论文表按分区写入缓存
+
+        complete 为 True 表示数据源是完整的（如 DBLP dump），没有论文的分区也记为 ok；
+        否则（如旧的爬取结果）没有论文的分区保持缺失，之后仍会在线抓取
+        """
+        groups = dict(list(df.groupby(['conference', 'year'])))
+        for conf in conferences:
+            for year in years:
+                part = groups.get((conf, year))
+                if part is None and not complete:
+                    continue
+                papers = part[COLUMNS].to_dict('records') if part is not None else []
+                self.write_partition(conf, year, papers, source=source)
+
+    def load(self, conferences=None, years=None):
+        """只读取指定会议、年份中状态为 ok 的分区，参数为 None 时表示不过滤"""
+        frames = []
+        for key, entry in sorted(self.manifest.items()):
+            conf, year = key.rsplit('/', 1)
+            year = int(year)
+            if conferences is not None and conf not in conferences:
+                continue
+            if years is not None and year not in years:
+                continue
+            if entry['status'] != 'ok' or entry['papers'] == 0:
+                continue
+            frames.append(pd.read_csv(self.partition_path(conf, year), keep_default_na=False))
+        if not frames:
+            return pd.DataFrame(columns=COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def summary(self):
+        """manifest 概要：每个分区的状态和论文数"""
+        rows = [dict(partition=key, **entry) for key, entry in sorted(self.manifest.items())]
+        return pd.DataFrame(rows)
@@ -0,0 +1,117 @@
+"""关键词 × (会议, 年份) 的稀疏词频索引
+
+矩阵的行是关键词，列是论文缓存中的一个 (会议, 年份) 分区，值为该词在该分区标题中
+出现的次数。索引保存在缓存目录下（term_index.npz 存矩阵，term_index.json 存词表、
+列和每列对应的分区抓取时间），之后只需对新增或重新抓取过的分区分词并替换对应的列。
+任意会议、年份切片的词频只是对若干列求和。
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from title_tokens import tokenize_titles
+
+
+class TermIndex:
+    def __init__(self, directory):
+        self.matrix_path = os.path.join(directory, 'term_index.npz')
+        self.meta_path = os.path.join(directory, 'term_index.json')
+        self.terms = []
+        self.term_ids = {}
+        self.columns = []       # 每列对应的分区 key，如 'AAAI/2020'
+        self.versions = {}      # 分区 key -> 建索引时该分区的 fetched_at
+        self.matrix = sparse.csc_matrix((0, 0), dtype=np.int64)
+        if os.path.exists(self.meta_path) and os.path.exists(self.matrix_path):
+            with open(self.meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            self.terms = meta['terms']
+            self.term_ids = {term: i for i, term in enumerate(self.terms)}
+            self.columns = meta['columns']
+            self.versions = meta['versions']
+            self.matrix = sparse.load_npz(self.matrix_path).tocsc()
+
+    def save(self):
+        sparse.save_npz(self.matrix_path, self.matrix.tocsr())
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'terms': self.terms, 'columns': self.columns, 'versions': self.versions},
+                      f, ensure_ascii=False)
+
+    def _count_column(self, counts):
+        """把一个分区的词频 Series 转为与当前词表对齐的稀疏列，词表中没有的词追加到末尾"""
+        for term in counts.index:
+            if term not in self.term_ids:
+                self.term_ids[term] = len(self.terms)
+                self.terms.append(term)
+        rows = np.fromiter((self.term_ids[t] for t in counts.index), dtype=np.int64, count=len(counts))
+        return rows, counts.to_numpy(dtype=np.int64)
+
+    def update(self, cache, processes=1):
+        """对 cache 中新增或重新抓取过的分区分词，更新对应的列，返回更新的分区数"""
+        stale = [key for key, entry in sorted(cache.manifest.items())
+                 if entry['status'] == 'ok' and self.versions.get(key) != entry['fetched_at']]
+        if not stale:
+            return 0
+        new_columns = {}
+        for key in stale:
+            conf, year = key.rsplit('/', 1)
+            titles = cache.load([conf], [int(year)])['title']
+            counts = tokenize_titles(titles, processes=processes).explode().dropna().value_counts()
+            new_columns[key] = self._count_column(counts)
+            self.versions[key] = cache.manifest[key]['fetched_at']
+
+        # 保留未变化的列，替换或追加更新过的列，统一扩展到新的词表长度
+        keep = [i for i, key in enumerate(self.columns) if key not in new_columns]
+        old = self.matrix[:, keep].tocoo()
+        columns = [self.columns[i] for i in keep] + list(new_columns)
+        rows, cols, data = [old.row], [old.col], [old.data]
+        for j, (key, (r, d)) in enumerate(new_columns.items(), start=len(keep)):
+            rows.append(r)
+            cols.append(np.full(len(r), j, dtype=np.int64))
+            data.append(d)
+        self.matrix = sparse.csc_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(len(self.terms), len(columns)), dtype=np.int64)
+        self.columns = columns
+        self.save()
+        return len(stale)
+
+    def frequencies(self, conferences=None, years=None, subtract=None):
+        """指定会议、年份切片内各关键词的总词频，按频率降序，None 表示不过滤
+
+        subtract 为可选的词频 Series（如近似重复论文的词频），从结果中扣除
+        """
+        selected = []
+        for j, key in enumerate(self.columns):
+            conf, year = key.rsplit('/', 1)
+            if conferences is not None and conf not in conferences:
+                continue
+            if years is not None and int(year) not in years:
+                continue
+            selected.append(j)
+        totals = np.asarray(self.matrix[:, selected].sum(axis=1)).ravel()
+        nonzero = np.flatnonzero(totals)
+        freq = pd.Series(totals[nonzero], index=np.asarray(self.terms, dtype=object)[nonzero])
+        if subtract is not None and len(subtract):
+            freq = freq.sub(subtract, fill_value=0).astype(np.int64)
+            freq = freq[freq > 0]
+        return freq.sort_values(ascending=False, kind='stable')
+
+    def top_k(self, k, conferences=None, years=None, exclude=(), subtract=None):
+        """切片内频率最高的 k 个关键词，exclude 中的词不计入"""
+        freq = self.frequencies(conferences, years, subtract)
+        if len(exclude):
+            freq = freq[~freq.index.isin(list(exclude))]
+        return freq.head(k)
+
+    def by_partition(self, terms):
+        """若干关键词在各 (会议, 年份) 分区中的词频表"""
+        ids = [self.term_ids[t] for t in terms if t in self.term_ids]
+        index = pd.MultiIndex.from_tuples(
+            [(conf, int(year)) for conf, year in (key.rsplit('/', 1) for key in self.columns)],
+            names=['conference', 'year'])
+        table = pd.DataFrame(self.matrix[ids, :].T.toarray(), index=index,
+                             columns=[self.terms[i] for i in ids])
+        return table.sort_index()
@@ -0,0 +1,40 @@
+"""离线读取 DBLP dump 的测试
+
+    python -m pytest -q
+"""
+import io
+
+from dblp_dump import iter_papers
+
+CONFERENCES = {'AAAI': 'aaai', 'ACL': 'acl'}
+
+
+def paper(key, crossref, title, year):
+    return (f'<inproceedings key="{key}"><author>A</author><title>{title}</title>'
+            f'<year>{year}</year><crossref>{crossref}</crossref><ee>https://doi.org/{key}</ee></inproceedings>')
+
+
+def parse(records, years=None):
+    xml = '<?xml version="1.0" encoding="UTF-8"?>\n<dblp>' + ''.join(records) + '</dblp>'
+    return list(iter_papers(io.BytesIO(xml.encode()), CONFERENCES, years))
+
+
+def test_workshop_records_sharing_the_prefix_are_skipped():
+    papers = parse([
+        paper('conf/aaai/Main20', 'conf/aaai/2020', 'Main Track Paper', 2020),
+        # workshop 论文的 key 同样以 conf/aaai/ 开头，但属于另一部论文集
+        paper('conf/aaai/Workshop20', 'conf/aaai/2020w', 'Workshop Paper', 2020),
+        paper('conf/aaai/Proc20', '', 'No Crossref', 2020),
+    ])
+    assert [p['title'] for p in papers] == ['Main Track Paper']
+    assert papers[0]['conference'] == 'AAAI' and papers[0]['year'] == 2020
+
+
+def test_split_volumes_and_year_filter():
+    papers = parse([
+        paper('conf/acl/Long22', 'conf/acl/2022-1', 'Long Paper', 2022),
+        paper('conf/acl/Short22', 'conf/acl/2022-2', 'Short Paper', 2022),
+        paper('conf/acl/Old21', 'conf/acl/2021-1', 'Old Paper', 2021),
+        paper('conf/cvpr/Other22', 'conf/cvpr/2022', 'Other Venue', 2022),
+    ], years={2022})
+    assert sorted(p['title'] for p in papers) == ['Long Paper', 'Short Paper']
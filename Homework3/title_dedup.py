@@ -0,0 +1,115 @@
+"""基于 MinHash + LSH 的近似重复论文检测
+
+同一篇论文可能以多条 DBLP 记录出现（workshop 版与正会版、勘误、改名后的版本）。
+把每个标题的关键词集合做 MinHash 签名，两个签名中相同位置取值相等的比例近似两个集合的
+Jaccard 相似度。签名按 bands × rows 切成若干段，任一段完全相同的两篇论文才成为候选对，
+因此只需对每段排序分桶，时间近似线性。候选对再用签名估计的相似度确认，
+最后用连通分量把互相重复的论文合并成组，组内最早的一条为代表，其余标记为重复。
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from title_tokens import tokenize_titles
+
+NUM_PERM = 64
+BANDS = 16
+THRESHOLD = 0.7
+MAX_BUCKET = 32
+MIX_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def minhash_signatures(tokens, num_perm=NUM_PERM, seed=1):
+    """词列表 Series -> (论文数 × num_perm) 的 MinHash 签名，没有关键词的论文整行为最大值
+
+    每个词先哈希成 64 位整数，第 i 个哈希函数为与随机种子异或后再做乘法、移位混合
+    """
+    words = tokens.explode().dropna()
+    paper_pos = np.repeat(np.arange(len(tokens)), tokens.map(len).to_numpy())
+    token_hashes = pd.util.hash_array(words.to_numpy(dtype=object))
+
+    rng = np.random.default_rng(seed)
+    seeds = rng.integers(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.uint64)
+    signatures = np.full((len(tokens), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+    if len(token_hashes) == 0:
+        return signatures
+    # 只对有关键词的论文做分段最小值，避免 reduceat 遇到空段
+    nonempty, starts = np.unique(paper_pos, return_index=True)
+    for i in range(num_perm):
+        hashed = (token_hashes ^ seeds[i]) * MIX_MULTIPLIER
+        hashed ^= hashed >> np.uint64(31)
+        signatures[nonempty, i] = np.minimum.reduceat(hashed, starts)
+    return signatures
+
+
+def candidate_pairs(signatures, bands=BANDS, groups=None, max_bucket=MAX_BUCKET):
+    """LSH 分桶，返回候选对 (i, j) 两个数组
+
+    groups 为可选的分组编号（如会议），只在同组论文之间找候选；
+    不超过 max_bucket 篇的桶内两两配对，更大的桶（如大量相同标题）只把排序后相邻的论文配对，
+    避免候选数按桶大小的平方增长
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    valid = signatures[:, 0] != np.iinfo(np.uint64).max
+    rng = np.random.default_rng(0)
+    left, right = [], []
+    for band in range(bands):
+        block = signatures[:, band * rows:(band + 1) * rows]
+        weights = rng.integers(1, np.iinfo(np.int64).max, size=rows, dtype=np.uint64) | np.uint64(1)
+        keys = (block * weights).sum(axis=1)
+        if groups is not None:
+            keys = keys * np.uint64(1_000_003) + np.asarray(groups, dtype=np.uint64)
+        idx = np.flatnonzero(valid)
+        idx = idx[np.argsort(keys[idx], kind='stable')]
+        sorted_keys = keys[idx]
+        bucket = np.cumsum(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) - 1
+        small = np.bincount(bucket)[bucket] <= max_bucket
+        # 同一个桶在排序后连续，位置 p 与 p + d 同桶即为一对；d 增大到没有这么大的桶为止
+        for d in range(1, len(idx)):
+            same = bucket[d:] == bucket[:-d]
+            if d > 1:
+                same &= small[d:]
+            if not same.any():
+                break
+            left.append(idx[:-d][same])
+            right.append(idx[d:][same])
+    if not left:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    return np.concatenate(left), np.concatenate(right)
+
+
+def find_duplicate_groups(tokens, groups=None, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """返回每篇论文所属重复组的编号（不与其他论文重复的论文自成一组）"""
+    signatures = minhash_signatures(tokens, num_perm)
+    left, right = candidate_pairs(signatures, bands, groups)
+    similarity = (signatures[left] == signatures[right]).mean(axis=1)
+    keep = similarity >= threshold
+    n = len(tokens)
+    graph = sparse.coo_matrix((np.ones(keep.sum(), dtype=np.int8), (left[keep], right[keep])), shape=(n, n))
+    return connected_components(graph, directed=False)[1]
+
+
+def mark_near_duplicates(df, threshold=THRESHOLD, same_venue=True, processes=1):
+    """给论文表增加 dup_group（重复组编号）和 is_duplicate（非代表记录）两列
+
+    每组中年份最早、其次行号最小的一条为代表；same_venue 为 True 时只在同一会议内找重复。
+    df 已有 tokens 列（如 main.preprocess_titles 的结果）时直接使用，不再重新分词
+    """
+    df = df.reset_index(drop=True)
+    if 'tokens' in df.columns:
+        tokens = df['tokens']
+    else:
+        tokens = tokenize_titles(df['title'], processes=processes)
+    groups = pd.factorize(df['conference'])[0] if same_venue else None
+    df['dup_group'] = find_duplicate_groups(tokens, groups, threshold)
+    representative = df.sort_values(['year'], kind='stable').groupby('dup_group').head(1).index
+    df['is_duplicate'] = ~df.index.isin(representative)
+    return df
+
+
+def drop_near_duplicates(df, **kwargs):
+    """去掉近似重复的论文，只保留每组的代表记录"""
+    df = mark_near_duplicates(df, **kwargs)
+    return df[~df['is_duplicate']].drop(columns=['dup_group', 'is_duplicate'])
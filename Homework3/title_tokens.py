@@ -0,0 +1,50 @@
+"""论文标题分词
+
+去掉非字母字符、转小写、按空白切分，再过滤长度不超过 2 的词和停用词，
+每个标题得到一个词列表。正则只编译一次，停用词集合在模块级构建一次，
+清洗和转小写用 pandas 字符串方法整列完成，切分和过滤是逐词的 Python 循环，
+标题很多时按块分给多个进程处理。
+"""
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+NON_ALPHA = re.compile(r'[^a-zA-Z\s]')
+STOP_WORDS = frozenset({
+    'for', 'and', 'with', 'using', 'based', 'via', 'towards', 'toward',
+    'learning', 'approach', 'method', 'network', 'deep', 'model', 'models',
+    'neural', 'new',
+})
+MIN_LENGTH = 3
+CHUNK_SIZE = 200_000
+
+
+def _tokenize_chunk(titles):
+    """对一块标题分词，返回词列表的列表"""
+    cleaned = titles.str.replace(NON_ALPHA, '', regex=True).str.lower()
+    stop_words = STOP_WORDS
+    return [[w for w in text.split() if len(w) >= MIN_LENGTH and w not in stop_words]
+            if isinstance(text, str) else []
+            for text in cleaned.tolist()]
+
+
+def tokenize_titles(titles, processes=1, chunk_size=CHUNK_SIZE):
+    """把标题 Series 转为词列表 Series
+
+    标题数超过 chunk_size 且 processes > 1 时按块分给进程池，否则在当前进程完成
+    """
+    if processes <= 1 or len(titles) <= chunk_size:
+        tokens = _tokenize_chunk(titles)
+    else:
+        chunks = [titles.iloc[i:i + chunk_size] for i in range(0, len(titles), chunk_size)]
+        tokens = []
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for part in executor.map(_tokenize_chunk, chunks):
+                tokens.extend(part)
+    return pd.Series(tokens, index=titles.index, dtype=object)
+
+
+def token_counts(tokens):
+    """词列表 Series 的词频，按频率降序"""
+    return tokens.explode().dropna().value_counts()
@@ -0,0 +1,107 @@
+"""各会议论文数量的 ARIMA 预测
+
+对每个会议的年度论文数序列，在一个小的 (p, d, q) 网格上拟合 ARIMA，按 AIC 选最优阶数，
+再预测下一年。各会议之间互不相关，交给进程池并行拟合。
+拟合结果（阶数、参数、AIC、预测值）按序列内容的哈希缓存到 JSON 文件，
+序列没有变化的会议直接读缓存，不再重新拟合。
+"""
+import hashlib
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+ORDER_GRID = [(p, d, q) for p in range(3) for d in range(2) for q in range(2)]
+
+
+def series_key(years, values, grid=ORDER_GRID, steps=1):
+    """序列（年份和取值）、候选阶数和预测步数共同决定的哈希"""
+    h = hashlib.sha1()
+    h.update(np.asarray(years, dtype=np.int64).tobytes())
+    h.update(np.asarray(values, dtype=np.float64).tobytes())
+    h.update(repr((grid, steps)).encode())
+    return h.hexdigest()
+
+
+def fit_best_arima(values, grid=ORDER_GRID, steps=1):
+    """在 grid 上逐个拟合 ARIMA，返回 AIC 最小的 {order, params, aic, forecast}，全部失败时返回 None"""
+    from statsmodels.tsa.arima.model import ARIMA
+    warnings.filterwarnings('ignore')
+    values = np.asarray(values, dtype=float)
+    best = None
+    for order in grid:
+        try:
+            result = ARIMA(values, order=order).fit()
+        except Exception:
+            continue
+        if not np.isfinite(result.aic):
+            continue
+        if best is None or result.aic < best['aic']:
+            best = {
+                'order': list(order),
+                'params': np.asarray(result.params).tolist(),
+                'aic': float(result.aic),
+                'forecast': np.asarray(result.forecast(steps=steps)).tolist(),
+            }
+    return best
+
+
+def _fit_task(args):
+    name, values, grid, steps = args
+    return name, fit_best_arima(values, grid, steps)
+
+
+def load_fit_cache(path):
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_fit_cache(cache, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def forecast_venues(counts, steps=1, grid=ORDER_GRID, processes=1, cache_path=None):
+    """对宽表 counts（行为会议，列为年份）中的每个会议预测未来 steps 年
+
+    返回以会议为索引的 DataFrame：order、aic、forecast（列表）、cached；
+    所有阶数都拟合失败的会议 order 为 None，forecast 为最近一年的值
+    """
+    years = [int(y) for y in counts.columns]
+    fit_cache = load_fit_cache(cache_path)
+    keys = {name: series_key(years, row.values, grid, steps) for name, row in counts.iterrows()}
+    todo = [(name, counts.loc[name].values, grid, steps)
+            for name, key in keys.items() if key not in fit_cache]
+
+    if todo:
+        print(f"拟合 {len(todo)} 个会议的 ARIMA（{len(grid)} 个候选阶数），{len(keys) - len(todo)} 个使用缓存")
+        if processes > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                chunksize = max(1, len(todo) // (processes * 4))
+                fitted = list(executor.map(_fit_task, todo, chunksize=chunksize))
+        else:
+            fitted = [_fit_task(task) for task in todo]
+        for name, best in fitted:
+            fit_cache[keys[name]] = best
+        if cache_path:
+            save_fit_cache(fit_cache, cache_path)
+
+    refit = {task[0] for task in todo}
+    rows = []
+    for name, key in keys.items():
+        best = fit_cache[key]
+        if best is None:
+            rows.append({'conference': name, 'order': None, 'aic': np.nan,
+                         'forecast': [float(counts.loc[name].iloc[-1])] * steps,
+                         'cached': name not in refit})
+        else:
+            rows.append({'conference': name, 'order': tuple(best['order']), 'aic': best['aic'],
+                         'forecast': best['forecast'], 'cached': name not in refit})
+    return pd.DataFrame(rows).set_index('conference')
@@ -6,23 +6,22 @@ from collections import Counter
 from scipy.stats import ttest_ind, chi2_contingency
 import seaborn as sns
 
-lottery_dataset = pd.read_excel('大乐透开奖数据统计.xlsx')
-weekday_mapping = {'星期一': 'Mon', '星期三': 'Wed', '星期六': 'Sat'}
-lottery_dataset['week_en'] = lottery_dataset['星期'].map(weekday_mapping)
+WEEKDAYS = ['Mon', 'Wed', 'Sat']
+front_number_labels = [str(i).zfill(2) for i in range(1, 36)]
+back_number_labels = [str(i).zfill(2) for i in range(1, 13)]
 
-monday_data = lottery_dataset[lottery_dataset['week_en'] == 'Mon']
-wednesday_data = lottery_dataset[lottery_dataset['week_en'] == 'Wed']
-saturday_data = lottery_dataset[lottery_dataset['week_en'] == 'Sat']
-weekday_groups = {'Mon': monday_data, 'Wed': wednesday_data, 'Sat': saturday_data}
 
-os.makedirs('result3', exist_ok=True)
+def number_frequency_table(dataset, column, labels):
+    """按星期统计号码出现次数，返回 星期 × 号码 的频率表"""
+    numbers = dataset[column].str.split().explode().str.zfill(2)
+    table = pd.crosstab(dataset.loc[numbers.index, 'week_en'].to_numpy(), numbers.to_numpy())
+    return table.reindex(index=WEEKDAYS, columns=labels, fill_value=0)
 
-plt.rcParams['font.sans-serif'] = ['SimHei']
-plt.rcParams['axes.unicode_minus'] = False
 
-for weekday_key, group_data in weekday_groups.items():
+def plot_sales_trend(sales, weekday_key):
+    """绘制某星期的销售额走势，sales 为以开奖日期为索引的销售额序列"""
     plt.figure(figsize=(10, 5))
-    plt.plot(pd.to_datetime(group_data['开奖日期']), group_data['总销售额'], marker='o')
+    plt.plot(sales.index, sales.values, marker='o')
     plt.title(f'销售额走势_{weekday_key}')
     plt.xlabel('开奖日期')
     plt.ylabel('总销售额')
@@ -31,39 +30,51 @@ for weekday_key, group_data in weekday_groups.items():
     plt.savefig(f'result3/销售额走势_{weekday_key}.png', dpi=200)
     plt.close()
 
-front_number_labels = [str(i).zfill(2) for i in range(1, 36)]
-back_number_labels = [str(i).zfill(2) for i in range(1, 13)]
-front_frequency_dict = {}
-back_frequency_dict = {}
-for weekday_key, group_data in weekday_groups.items():
-    front_numbers_list = []
-    back_numbers_list = []
-    for index, data_row in group_data.iterrows():
-        front_numbers_list.extend([x.zfill(2) for x in data_row['前区号码'].strip().split()])
-        back_numbers_list.extend([x.zfill(2) for x in data_row['后区号码'].strip().split()])
-    front_frequency_dict[weekday_key] = np.array([front_numbers_list.count(x) for x in front_number_labels])
-    back_frequency_dict[weekday_key] = np.array([back_numbers_list.count(x) for x in back_number_labels])
 
-for weekday_key in weekday_groups:
-    plt.figure(figsize=(14, 6))
-    plt.bar(front_number_labels, front_frequency_dict[weekday_key])
-    plt.title(f'前区号码频率_{weekday_key}')
-    plt.xlabel('前区号码')
+def plot_number_frequency(frequency, title, xlabel, path, figsize, rotation, color=None):
+    """绘制号码频率柱状图，frequency 为以号码为索引的出现次数"""
+    plt.figure(figsize=figsize)
+    plt.bar(frequency.index, frequency.values, color=color)
+    plt.title(title)
+    plt.xlabel(xlabel)
     plt.ylabel('出现次数')
-    plt.xticks(rotation=90)
+    plt.xticks(rotation=rotation)
     plt.tight_layout()
-    plt.savefig(f'result3/前区号码频率_{weekday_key}.png', dpi=200)
-    plt.close()
-    plt.figure(figsize=(8, 4))
-    plt.bar(back_number_labels, back_frequency_dict[weekday_key], color='orange')
-    plt.title(f'后区号码频率_{weekday_key}')
-    plt.xlabel('后区号码')
-    plt.ylabel('出现次数')
-    plt.xticks(rotation=0)
-    plt.tight_layout()
-    plt.savefig(f'result3/后区号码频率_{weekday_key}.png', dpi=200)
+    plt.savefig(path, dpi=200)
     plt.close()
 
+
+lottery_dataset = pd.read_excel('大乐透开奖数据统计.xlsx')
+weekday_mapping = {'星期一': 'Mon', '星期三': 'Wed', '星期六': 'Sat'}
+lottery_dataset['week_en'] = lottery_dataset['星期'].map(weekday_mapping)
+
+monday_data = lottery_dataset[lottery_dataset['week_en'] == 'Mon']
+wednesday_data = lottery_dataset[lottery_dataset['week_en'] == 'Wed']
+saturday_data = lottery_dataset[lottery_dataset['week_en'] == 'Sat']
+weekday_groups = {'Mon': monday_data, 'Wed': wednesday_data, 'Sat': saturday_data}
+
+os.makedirs('result3', exist_ok=True)
+
+plt.rcParams['font.sans-serif'] = ['SimHei']
+plt.rcParams['axes.unicode_minus'] = False
+
+# 先聚合：各星期的销售额序列和号码频率表，作图函数只接收聚合后的结果
+sales_by_weekday = {weekday_key: group_data.set_index(pd.to_datetime(group_data['开奖日期']))['总销售额']
+                    for weekday_key, group_data in weekday_groups.items()}
+front_frequency_table = number_frequency_table(lottery_dataset, '前区号码', front_number_labels)
+back_frequency_table = number_frequency_table(lottery_dataset, '后区号码', back_number_labels)
+front_frequency_dict = {key: front_frequency_table.loc[key].to_numpy() for key in WEEKDAYS}
+back_frequency_dict = {key: back_frequency_table.loc[key].to_numpy() for key in WEEKDAYS}
+
+for weekday_key, sales in sales_by_weekday.items():
+    plot_sales_trend(sales, weekday_key)
+
+for weekday_key in weekday_groups:
+    plot_number_frequency(front_frequency_table.loc[weekday_key], f'前区号码频率_{weekday_key}', '前区号码',
+                          f'result3/前区号码频率_{weekday_key}.png', (14, 6), 90)
+    plot_number_frequency(back_frequency_table.loc[weekday_key], f'后区号码频率_{weekday_key}', '后区号码',
+                          f'result3/后区号码频率_{weekday_key}.png', (8, 4), 0, color='orange')
+
 monday_sales = monday_data['总销售额'].values
 wednesday_sales = wednesday_data['总销售额'].values
 excluded_date = '2025-02-08'
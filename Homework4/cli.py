@@ -0,0 +1,36 @@
+"""Homework4 统一入口
+
+每个子命令对应一个脚本，只在执行该脚本时才导入它用到的库（requests、statsmodels、scipy、seaborn 等），
+本文件本身只依赖标准库。可以一次执行多个子命令，例如：
+
+    python cli.py features number-predict
+
+各模块的导入耗时可以用仓库根目录的 import_report.py 查看：python ../import_report.py cli.py crawl
+"""
+import argparse
+import runpy
+
+COMMANDS = {
+    'crawl': ('Crawl.py', '爬取大乐透开奖历史数据'),
+    'sales-predict': ('MonPre.py', '销售额时间序列预测'),
+    'number-predict': ('NumPre.py', '号码频率统计与推荐'),
+    'features': ('FeaAnaly.py', '按星期分组的销售额与号码特征分析'),
+    'expert-crawl': ('ExpertCrawl.py', '爬取专家信息'),
+    'expert-analysis': ('ExpertAnaly.py', '专家属性与中奖情况分析'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='大乐透数据采集与分析',
+        epilog='子命令: ' + '；'.join(f'{name}（{script}）{desc}' for name, (script, desc) in COMMANDS.items()))
+    parser.add_argument('commands', nargs='+', choices=list(COMMANDS), help='要执行的子命令，按顺序执行')
+    args = parser.parse_args()
+    for command in args.commands:
+        script = COMMANDS[command][0]
+        print(f"== {command}: {script}")
+        runpy.run_path(script, run_name='__main__')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""导入耗时报告
+
+在当前进程中运行任意一个作业脚本（与 python 脚本 参数... 相同），记录主线程中每个模块第一次导入
+（含其依赖）的耗时，结束时打印，用来检查各入口是否只在需要时才导入 matplotlib、statsmodels 等重型库。
+在脚本所在目录下运行，例如：
+
+    cd Homework3 && python ../import_report.py main.py keywords
+    cd Homework4 && python ../import_report.py cli.py features number-predict
+"""
+import builtins
+import os
+import runpy
+import sys
+import threading
+import time
+
+
+class ImportTimer:
+    """记录主线程中每个模块第一次导入（含其依赖）的耗时"""
+    def __init__(self):
+        self.times = {}
+        self._depth = 0
+        self._original = builtins.__import__
+
+    def __enter__(self):
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._original
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if self._depth or level or name in sys.modules or threading.current_thread() is not threading.main_thread():
+            return self._original(name, globals, locals, fromlist, level)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            self.times[name] = self.times.get(name, 0) + time.perf_counter() - start
+
+    def report(self, total):
+        print("\n导入耗时报告（秒）:")
+        for name, seconds in sorted(self.times.items(), key=lambda x: -x[1]):
+            if seconds >= 0.005:
+                print(f"  {name}: {seconds:.2f}")
+        print(f"  导入合计: {sum(self.times.values()):.2f}，总运行时间: {total:.2f}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+    script = sys.argv[1]
+    # 与直接运行脚本一致：argv 从脚本名开始，脚本所在目录在 sys.path 最前面
+    sys.argv = sys.argv[1:]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    start = time.perf_counter()
+    with ImportTimer() as timer:
+        try:
+            runpy.run_path(script, run_name='__main__')
+        finally:
+            timer.report(time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()